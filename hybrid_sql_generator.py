@@ -6,27 +6,156 @@ Combines AI-powered natural language understanding with rule-based validation an
 
 import re
 import os
+import sys
+import string
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
+# google.generativeai is imported lazily in HybridSQLGenerator.__init__:
+# it drags in grpc/protobuf and costs hundreds of ms at import time, which
+# rule-based-only users (no API key) should never pay
+
 try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    GEMINI_AVAILABLE = False
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 from sql_optimizer_engine import SQLOptimizerEngine, OptimizationLevel
 
+# Patterns used on the validate/generate hot path, compiled once at import so
+# each call pays only for the scan itself
+_TABLE_REF_RE = re.compile(r'(?:from|join|update|insert\s+into)\s+(\w+)', re.IGNORECASE)
+_FIRST_KEYWORD_RE = re.compile(r'\s*(\w+)')
+_SQL_COMMANDS = frozenset({'select', 'insert', 'update', 'delete', 'with', 'merge'})
+# Case-insensitive searches replace `needle in query.lower()` membership
+# checks so no validator has to allocate a lowered copy of the query
+_SELECT_RE = re.compile(r'select', re.IGNORECASE)
+_FROM_RE = re.compile(r'from', re.IGNORECASE)
+_SELECT_STAR_RE = re.compile(r'select \*', re.IGNORECASE)
+_WHERE_RE = re.compile(r'where', re.IGNORECASE)
+_LIMIT_RE = re.compile(r'limit', re.IGNORECASE)
+_INJECTION_PATTERNS = [
+    re.compile(r';\s*drop\s+table', re.IGNORECASE),
+    re.compile(r'union\s+select.*from', re.IGNORECASE),
+    re.compile(r'--\s*$'),
+    re.compile(r'/\*.*\*/')
+]
+# Literal substrings behind the security scan. One automaton (or combined
+# regex) pass collects every hit; the anchored injection regexes only run
+# when their literal cores actually appear in the query.
+_DANGEROUS_KEYWORDS = ('drop', 'truncate', 'delete', 'alter', 'create', 'grant', 'revoke')
+_INJECTION_LITERALS = ('--', '/*', 'union', ';')
+
+if AHOCORASICK_AVAILABLE:
+    _DANGER_AUTOMATON = ahocorasick.Automaton()
+    for _kw in _DANGEROUS_KEYWORDS + _INJECTION_LITERALS:
+        _DANGER_AUTOMATON.add_word(_kw, _kw)
+    _DANGER_AUTOMATON.make_automaton()
+    _DANGER_RE = None
+else:
+    _DANGER_AUTOMATON = None
+    _DANGER_RE = re.compile('|'.join(map(re.escape, _DANGEROUS_KEYWORDS + _INJECTION_LITERALS)),
+                            re.IGNORECASE)
+
+# With python-hyperscan installed the whole security pattern set compiles
+# into one JIT'd database scanned in a single SIMD pass; ids below the
+# keyword count map back to _DANGEROUS_KEYWORDS, the rest are injection hits
+if HYPERSCAN_AVAILABLE:
+    _HS_SECURITY_DB = hyperscan.Database()
+    _hs_flags = hyperscan.HS_FLAG_CASELESS
+    _HS_SECURITY_DB.compile(
+        expressions=[re.escape(kw).encode() for kw in _DANGEROUS_KEYWORDS] + [
+            rb';\s*drop\s+table',
+            rb'union\s+select.*from',
+            rb'--\s*$',
+            rb'/\*.*\*/'
+        ],
+        ids=list(range(len(_DANGEROUS_KEYWORDS) + 4)),
+        flags=[_hs_flags] * len(_DANGEROUS_KEYWORDS) + [
+            _hs_flags,
+            _hs_flags | hyperscan.HS_FLAG_DOTALL,
+            _hs_flags | hyperscan.HS_FLAG_MULTILINE,
+            _hs_flags | hyperscan.HS_FLAG_DOTALL
+        ]
+    )
+else:
+    _HS_SECURITY_DB = None
+
+def _make_template_renderer(template: str):
+    """Specialize a fallback template into a straight-line render closure
+
+    The template is split into (literal, key) chunks exactly once at
+    pattern-load time; rendering a match is then a join over those chunks
+    with the parameter extraction inlined. Same effect as exec-generated
+    code per pattern, without the exec.
+    """
+    parts = [(literal, key) for literal, key, _, _ in string.Formatter().parse(template)]
+
+    def render(match):
+        groups = match.groups()
+        values = {
+            'limit': groups[0] if groups and groups[0].isdigit() else '10',
+            'table': groups[1] if len(groups) > 1 else 'users',
+            'column': groups[2] if len(groups) > 2 else 'id',
+            'value': groups[2] if len(groups) > 2 else 'unknown',
+        }
+        return ''.join(
+            literal + (values.get(key, '') if key else '')
+            for literal, key in parts
+        )
+
+    return render
+
+def _parens_balanced(query: str) -> bool:
+    """Tight scalar scan kept free of attribute lookups so it stays cheap
+
+    The loop body only touches locals, which is as close to compiled code
+    as plain CPython gets for this kind of branchy byte-level check.
+    """
+    if '(' not in query:
+        return ')' not in query
+    depth = 0
+    for ch in query:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0
+
+# Strips markdown fences and line comments from AI responses in one pass
+_CLEAN_RE = re.compile(r'```sql\s*|```|--.*$', re.MULTILINE)
+_TABLE_DDL_RE = re.compile(r'CREATE TABLE\s+(\w+)\s*\((.*?)\)', re.DOTALL | re.IGNORECASE)
+_COL_RE = re.compile(r'\s*(\w+)\s+(\w+)([^,]*)')
+_PK_RE = re.compile(r'\bprimary\b.*\bkey\b', re.IGNORECASE | re.DOTALL)
+_CONSTRAINT_KEYWORDS = frozenset({'primary', 'foreign', 'unique', 'constraint', 'check', 'key'})
+
 class GenerationStatus(Enum):
     SUCCESS = "success"
     VALIDATION_FAILED = "validation_failed"
     AI_UNAVAILABLE = "ai_unavailable"
     FALLBACK_USED = "fallback_used"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HybridGenerationResult:
-    """Result from the hybrid SQL generation process"""
+    """Result from the hybrid SQL generation process
+
+    Slotted and frozen: bulk generation allocates one of these per query,
+    so skipping the per-instance __dict__ keeps them small, and freezing
+    makes cached results safe to hand out to multiple callers.
+    """
     query: str
     status: GenerationStatus
     validation_errors: List[str]
@@ -40,74 +169,72 @@ class QueryValidator:
     
     def __init__(self, schema_info: Dict = None):
         self.schema_info = schema_info or {}
+        # Materialized once - compliance checks just load the attribute
+        self._available_tables = frozenset(self.schema_info.get('tables', {}).keys())
     
     def validate_query(self, query: str) -> Tuple[bool, List[str]]:
         """Comprehensive validation of generated SQL query"""
         errors = []
-        
+
+        # Every sub-validator works on the raw query via IGNORECASE
+        # patterns, so no lowered copy is ever allocated
+
         # 1. Syntax validation
         syntax_errors = self._validate_syntax(query)
         errors.extend(syntax_errors)
-        
+
         # 2. Schema compliance
         schema_errors = self._validate_schema_compliance(query)
         errors.extend(schema_errors)
-        
+
         # 3. Security checks
         security_errors = self._validate_security(query)
         errors.extend(security_errors)
-        
+
         # 4. Performance red flags
         performance_errors = self._validate_performance_basics(query)
         errors.extend(performance_errors)
-        
+
         return len(errors) == 0, errors
-    
+
     def _validate_syntax(self, query: str) -> List[str]:
         """Basic syntax validation"""
         errors = []
-        query_lower = query.lower().strip()
-        
-        # Check for basic SQL structure
-        if not any(keyword in query_lower for keyword in ['select', 'insert', 'update', 'delete']):
+
+        # Check for basic SQL structure: match the leading keyword instead of
+        # substring-scanning the whole query for each command, which also
+        # stops a WHERE literal like 'delete' from passing the check
+        first = _FIRST_KEYWORD_RE.match(query)
+        if first is None or first.group(1).lower() not in _SQL_COMMANDS:
             errors.append("Query does not contain a valid SQL command")
-        
-        # Check for balanced parentheses
-        if query.count('(') != query.count(')'):
+
+        # Check for balanced parentheses (single pass, catches ")(" too)
+        if not _parens_balanced(query):
             errors.append("Unbalanced parentheses in query")
-        
+
         # Check for basic SELECT structure
-        if 'select' in query_lower:
-            if 'from' not in query_lower:
+        if _SELECT_RE.search(query):
+            if not _FROM_RE.search(query):
                 errors.append("SELECT query missing FROM clause")
-        
+
         return errors
     
     def _validate_schema_compliance(self, query: str) -> List[str]:
         """Validate query against known schema"""
         errors = []
-        
-        if not self.schema_info or 'tables' not in self.schema_info:
+
+        if not self._available_tables:
             return errors  # Skip if no schema info available
-        
-        query_lower = query.lower()
-        available_tables = set(self.schema_info['tables'].keys())
-        
-        # Extract table references (basic pattern matching)
-        table_patterns = [
-            r'from\s+(\w+)',
-            r'join\s+(\w+)',
-            r'update\s+(\w+)',
-            r'insert\s+into\s+(\w+)'
-        ]
-        
-        referenced_tables = set()
-        for pattern in table_patterns:
-            matches = re.findall(pattern, query_lower)
-            referenced_tables.update(matches)
-        
+
+        # One alternation pass over the raw query replaces four full scans;
+        # IGNORECASE avoids allocating a lowered copy of the query. Interned
+        # names let the set difference compare by pointer identity, since
+        # _parse_schema interns the schema side too.
+        referenced_tables = {sys.intern(m.group(1).lower())
+                             for m in _TABLE_REF_RE.finditer(query)}
+
         # Check if referenced tables exist
-        unknown_tables = referenced_tables - available_tables
+        unknown_tables = referenced_tables - self._available_tables
         if unknown_tables:
             errors.append(f"Unknown tables referenced: {', '.join(unknown_tables)}")
         
@@ -116,61 +243,104 @@ class QueryValidator:
     def _validate_security(self, query: str) -> List[str]:
         """Check for potentially dangerous SQL patterns"""
         errors = []
-        query_lower = query.lower()
-        
+
+        # Single JIT'd multi-pattern scan when hyperscan is available
+        # (the database is compiled CASELESS, so the raw query works)
+        if _HS_SECURITY_DB is not None:
+            hit_ids = set()
+            _HS_SECURITY_DB.scan(
+                query.encode(),
+                match_event_handler=lambda pid, start, end, flags, ctx: hit_ids.add(pid)
+            )
+            found_dangerous = [kw for i, kw in enumerate(_DANGEROUS_KEYWORDS) if i in hit_ids]
+            if found_dangerous:
+                errors.append(f"Potentially dangerous operations detected: {', '.join(found_dangerous)}")
+            if any(pid >= len(_DANGEROUS_KEYWORDS) for pid in hit_ids):
+                errors.append("Potential SQL injection pattern detected")
+            return errors
+
+        # One linear pass over the query collects every literal of interest.
+        # The Aho-Corasick automaton is case-sensitive, so only that branch
+        # still lowers the input; the regex branch matches case-insensitively.
+        if _DANGER_AUTOMATON is not None:
+            hits = {kw for _, kw in _DANGER_AUTOMATON.iter(query.lower())}
+        else:
+            hits = {h.lower() for h in _DANGER_RE.findall(query)}
+
         # Dangerous operations
-        dangerous_keywords = ['drop', 'truncate', 'delete', 'alter', 'create', 'grant', 'revoke']
-        found_dangerous = [kw for kw in dangerous_keywords if kw in query_lower]
-        
+        found_dangerous = [kw for kw in _DANGEROUS_KEYWORDS if kw in hits]
+
         if found_dangerous:
             errors.append(f"Potentially dangerous operations detected: {', '.join(found_dangerous)}")
-        
-        # SQL injection patterns
-        injection_patterns = [
-            r';\s*drop\s+table',
-            r'union\s+select.*from',
-            r'--\s*$',
-            r'/\*.*\*/'
-        ]
-        
-        for pattern in injection_patterns:
-            if re.search(pattern, query_lower):
-                errors.append("Potential SQL injection pattern detected")
-                break
-        
+
+        # SQL injection patterns - only worth running when a literal core hit
+        if not hits.isdisjoint(_INJECTION_LITERALS):
+            for pattern in _INJECTION_PATTERNS:
+                if pattern.search(query):
+                    errors.append("Potential SQL injection pattern detected")
+                    break
+
         return errors
-    
+
     def _validate_performance_basics(self, query: str) -> List[str]:
         """Check for basic performance issues"""
         errors = []
-        query_lower = query.lower()
-        
+
         # Check for SELECT * on potentially large tables
-        if 'select *' in query_lower and 'limit' not in query_lower:
+        if _SELECT_STAR_RE.search(query) and not _LIMIT_RE.search(query):
             errors.append("SELECT * without LIMIT may impact performance")
-        
+
         # Check for missing WHERE clause on SELECT
-        if 'select' in query_lower and 'where' not in query_lower and 'limit' not in query_lower:
+        if _SELECT_RE.search(query) and not _WHERE_RE.search(query) and not _LIMIT_RE.search(query):
             errors.append("SELECT without WHERE clause may return too many rows")
-        
+
         return errors
 
+def _specialize_validator(schema_info: Dict):
+    """Bake one schema into a dedicated QueryValidator subclass
+
+    A generator instance serves a single schema for its lifetime, so the
+    table view and schema dict are installed as class attributes: the hot
+    lookups in the validators resolve through CPython's per-class attribute
+    cache instead of an instance __dict__.
+    """
+    return type('SpecializedQueryValidator', (QueryValidator,), {
+        '__init__': object.__init__,
+        'schema_info': schema_info,
+        '_available_tables': frozenset(schema_info.get('tables', {}).keys()),
+    })
+
 class HybridSQLGenerator:
     """Hybrid SQL Generator combining AI and Rule-based approaches"""
     
     def __init__(self, api_key: str = None):
         self.api_key = api_key
-        self.gemini_available = GEMINI_AVAILABLE and api_key
+        if api_key:
+            try:
+                import google.generativeai as genai
+                self._genai = genai
+                self.gemini_available = True
+            except ImportError:
+                self.gemini_available = False
+        else:
+            self.gemini_available = False
         
         # Initialize components
         self.optimizer = SQLOptimizerEngine()
         self.validator = QueryValidator()
+        # Validators are reused per DDL text so their table views aren't rebuilt
+        self._validator_cache = {}
+        # Finished results memoized per (schema, description); repeated
+        # descriptions skip the whole pipeline including the network call
+        self._result_cache = OrderedDict()
+        self._schema_hash = hash('')
+        self._set_prompt_prefix('No schema provided')
         
         # Initialize Gemini if available
         if self.gemini_available:
             try:
-                genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash')
+                self._genai.configure(api_key=api_key)
+                self.model = self._genai.GenerativeModel('gemini-1.5-flash')
                 print("✅ Gemini API initialized successfully")
             except Exception as e:
                 print(f"❌ Failed to initialize Gemini: {e}")
@@ -178,17 +348,55 @@ class HybridSQLGenerator:
         
         # Fallback patterns (simplified version of ultimate patterns)
         self.fallback_patterns = self._load_fallback_patterns()
+        self._fallback_by_id = {p['id']: p for p in self.fallback_patterns}
+        # One combined alternation answers "does anything match, and what?"
+        # in a single scan; the winner's own regex is re-run for captures
+        self._fallback_dispatch_re = re.compile(
+            '|'.join(f"(?P<{p['id']}>{p['pattern']})" for p in self.fallback_patterns),
+            re.IGNORECASE
+        )
     
     def set_schema(self, schema_ddl: str):
         """Set database schema for all components"""
-        schema_info = self._parse_schema(schema_ddl)
-        self.optimizer.set_schema(schema_ddl)
-        self.validator = QueryValidator(schema_info)
+        self.install_parsed_schema(self._parse_schema(schema_ddl), schema_ddl)
+
+    def install_parsed_schema(self, schema_info: Dict, schema_ddl: str):
+        """Install an already-parsed schema, skipping the DDL re-parse
+
+        The optimizer and validator share the same parsed dict, so one parse
+        (possibly cached by the caller) covers all components.
+        """
+        self.optimizer.install_parsed_schema(schema_info)
+        validator = self._validator_cache.get(schema_ddl)
+        if validator is None:
+            validator = _specialize_validator(schema_info)()
+            if len(self._validator_cache) >= 32:
+                self._validator_cache.clear()
+            self._validator_cache[schema_ddl] = validator
+        self.validator = validator
         self.schema_ddl = schema_ddl
+        self._schema_hash = hash(schema_ddl)
+        self._set_prompt_prefix(schema_ddl)
     
+    _RESULT_CACHE_MAX = 256
+
     def generate_query(self, description: str) -> HybridGenerationResult:
         """Generate SQL query using hybrid approach"""
-        
+        key = (self._schema_hash, description)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+            return cached
+
+        result = self._generate_query_uncached(description)
+        self._result_cache[key] = result
+        if len(self._result_cache) > self._RESULT_CACHE_MAX:
+            self._result_cache.popitem(last=False)
+        return result
+
+    def _generate_query_uncached(self, description: str) -> HybridGenerationResult:
+        """Run the full generation pipeline (no memoization)"""
+
         # Step 1: Try AI generation first
         if self.gemini_available:
             try:
@@ -220,7 +428,111 @@ class HybridSQLGenerator:
         
         # Step 2: Use rule-based fallback
         return self._generate_with_fallback(description, ["AI not available"])
-    
+
+    def generate_queries(self, descriptions: List[str]) -> List[HybridGenerationResult]:
+        """Generate queries for several descriptions, overlapping the AI calls
+
+        The Gemini round-trips run concurrently under asyncio, so N requests
+        cost roughly one network round-trip instead of N sequential ones.
+        Without an AI key this degrades to the sequential (memoized) path.
+        """
+        if not (self.gemini_available and descriptions):
+            return [self.generate_query(d) for d in descriptions]
+        return asyncio.run(self._generate_queries_async(descriptions))
+
+    async def _generate_queries_async(self, descriptions: List[str]) -> List[HybridGenerationResult]:
+        return list(await asyncio.gather(
+            *(self._generate_query_async(d) for d in descriptions)
+        ))
+
+    async def _generate_query_async(self, description: str) -> HybridGenerationResult:
+        """Async twin of generate_query sharing the same result cache"""
+        key = (self._schema_hash, description)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+            return cached
+
+        try:
+            ai_query = await self._generate_with_ai_async(description)
+        except Exception as e:
+            print(f"AI generation failed: {e}")
+            result = self._generate_with_fallback(description, [f"AI error: {str(e)}"])
+        else:
+            if ai_query:
+                is_valid, validation_errors = self.validator.validate_query(ai_query)
+                if is_valid:
+                    optimized_query = self.optimizer.generate_optimized_query(ai_query)
+                    analysis = self.optimizer.analyze_query(optimized_query)
+                    result = HybridGenerationResult(
+                        query=optimized_query,
+                        status=GenerationStatus.SUCCESS,
+                        validation_errors=[],
+                        optimization_suggestions=[s.suggestion for s in analysis.suggestions],
+                        performance_score=analysis.performance_score,
+                        generation_method="AI + Rule-based Optimization",
+                        confidence_score=0.95
+                    )
+                else:
+                    result = self._generate_with_fallback(description, validation_errors)
+            else:
+                result = self._generate_with_fallback(description, ["AI not available"])
+
+        self._result_cache[key] = result
+        if len(self._result_cache) > self._RESULT_CACHE_MAX:
+            self._result_cache.popitem(last=False)
+        return result
+
+    async def _generate_with_ai_async(self, description: str) -> Optional[str]:
+        """Generate SQL via Gemini without blocking the event loop"""
+        prompt = self._create_ai_prompt(description)
+        response = await self.model.generate_content_async(prompt)
+        if response.text:
+            return self._extract_sql_from_response(response.text)
+        return None
+
+    def stream_generate_query(self, description: str):
+        """Yield raw SQL text chunks from Gemini as they arrive
+
+        Streaming variant of the AI path for progressive rendering: the first
+        tokens become visible without waiting for the full round-trip. The
+        streamed text is unvalidated - pass the collected buffer to
+        finalize_streamed_query to get a validated HybridGenerationResult.
+        Falls back to yielding the rule-based query in one chunk when the AI
+        path is unavailable.
+        """
+        if self.gemini_available:
+            try:
+                prompt = self._create_ai_prompt(description)
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    if chunk.text:
+                        yield chunk.text
+                return
+            except Exception as e:
+                print(f"Gemini streaming error: {e}")
+        yield self._generate_with_fallback(description, ["AI not available"]).query
+
+    def finalize_streamed_query(self, streamed_text: str, description: str) -> HybridGenerationResult:
+        """Validate and optimize text collected from stream_generate_query"""
+        sql_query = self._extract_sql_from_response(streamed_text)
+        is_valid, validation_errors = self.validator.validate_query(sql_query)
+
+        if is_valid:
+            optimized_query = self.optimizer.generate_optimized_query(sql_query)
+            analysis = self.optimizer.analyze_query(optimized_query)
+
+            return HybridGenerationResult(
+                query=optimized_query,
+                status=GenerationStatus.SUCCESS,
+                validation_errors=[],
+                optimization_suggestions=[s.suggestion for s in analysis.suggestions],
+                performance_score=analysis.performance_score,
+                generation_method="AI + Rule-based Optimization",
+                confidence_score=0.95
+            )
+
+        return self._generate_with_fallback(description, validation_errors)
+
     def _generate_with_ai(self, description: str) -> Optional[str]:
         """Generate SQL using Gemini API"""
         
@@ -228,28 +540,23 @@ class HybridSQLGenerator:
         prompt = self._create_ai_prompt(description)
         
         try:
-            response = self.model.generate_content(prompt)
-            
-            if response.text:
+            # Stream the response so chunk accumulation overlaps the network
+            # transfer instead of waiting for the whole body to buffer
+            parts = []
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    parts.append(chunk.text)
+
+            if parts:
                 # Extract SQL from response (handle markdown formatting)
-                sql_query = self._extract_sql_from_response(response.text)
-                return sql_query
+                return self._extract_sql_from_response(''.join(parts))
         except Exception as e:
             print(f"Gemini API error: {e}")
             return None
-        
+
         return None
     
-    def _create_ai_prompt(self, description: str) -> str:
-        """Create a comprehensive prompt for AI generation"""
-        
-        base_prompt = f"""
-You are an expert SQL developer. Generate a syntactically correct SQL query based on the user's request.
-
-Database Schema:
-{getattr(self, 'schema_ddl', 'No schema provided')}
-
-User Request: {description}
+    _PROMPT_SUFFIX = """
 
 Requirements:
 1. Generate only valid SQL syntax
@@ -261,29 +568,42 @@ Requirements:
 
 Return ONLY the SQL query, no explanations or markdown formatting.
 """
-        return base_prompt
+
+    def _set_prompt_prefix(self, schema_ddl: str):
+        """Render the schema-dependent half of the AI prompt once per schema"""
+        self._prompt_prefix = f"""
+You are an expert SQL developer. Generate a syntactically correct SQL query based on the user's request.
+
+Database Schema:
+{schema_ddl}
+
+User Request: """
+
+    def _create_ai_prompt(self, description: str) -> str:
+        """Create a comprehensive prompt for AI generation"""
+        # The schema half is pre-rendered in _set_prompt_prefix, so each call
+        # is a plain three-string concatenation
+        return self._prompt_prefix + description + self._PROMPT_SUFFIX
     
     def _extract_sql_from_response(self, response_text: str) -> str:
         """Extract SQL query from AI response"""
-        # Remove markdown formatting
-        cleaned = re.sub(r'```sql\s*', '', response_text)
-        cleaned = re.sub(r'```', '', cleaned)
-        
-        # Remove extra whitespace and comments
-        cleaned = re.sub(r'--.*$', '', cleaned, flags=re.MULTILINE)
-        cleaned = cleaned.strip()
-        
-        return cleaned
+        # Remove markdown formatting and line comments in a single pass
+        return _CLEAN_RE.sub('', response_text).strip()
     
     def _generate_with_fallback(self, description: str, errors: List[str]) -> HybridGenerationResult:
         """Generate using rule-based fallback system"""
         
-        # Try pattern matching
-        for pattern_info in self.fallback_patterns:
-            match = re.search(pattern_info['pattern'], description, re.IGNORECASE)
+        # Try pattern matching: one combined scan picks the winner, then its
+        # own regex runs once more to extract the capture groups
+        dispatch = self._fallback_dispatch_re.search(description)
+        if dispatch:
+            winner = next(name for name, hit in dispatch.groupdict().items()
+                          if hit is not None)
+            pattern_info = self._fallback_by_id[winner]
+            match = pattern_info['compiled'].search(description)
             if match:
-                query = self._apply_pattern_template(pattern_info, match, description)
-                
+                query = pattern_info['renderer'](match)
+
                 # Optimize with rule-based system
                 optimized_query = self.optimizer.generate_optimized_query(query)
                 analysis = self.optimizer.analyze_query(optimized_query)
@@ -312,7 +632,7 @@ Return ONLY the SQL query, no explanations or markdown formatting.
     
     def _load_fallback_patterns(self) -> List[Dict]:
         """Load simplified patterns for fallback generation"""
-        return [
+        patterns = [
             {
                 'id': 'top_records',
                 'pattern': r'(?:show|get|find).*?top\s+(\d+).*?(\w+)',
@@ -329,25 +649,12 @@ Return ONLY the SQL query, no explanations or markdown formatting.
                 'template': 'SELECT * FROM {table} WHERE {column} = \'{value}\''
             }
         ]
-    
-    def _apply_pattern_template(self, pattern_info: Dict, match, description: str) -> str:
-        """Apply pattern template with extracted parameters"""
-        template = pattern_info['template']
-        groups = match.groups()
-        
-        # Basic parameter extraction (can be enhanced)
-        replacements = {}
-        if groups:
-            replacements['limit'] = groups[0] if groups and groups[0].isdigit() else '10'
-            replacements['table'] = groups[1] if len(groups) > 1 else 'users'
-            replacements['column'] = groups[2] if len(groups) > 2 else 'id'
-            replacements['value'] = groups[2] if len(groups) > 2 else 'unknown'
-        
-        # Apply replacements
-        for key, value in replacements.items():
-            template = template.replace(f'{{{key}}}', value)
-        
-        return template
+        # Compile the regex and build a straight-line renderer per pattern,
+        # so a fallback hit does no template parsing or dict plumbing at all
+        for pattern_info in patterns:
+            pattern_info['compiled'] = re.compile(pattern_info['pattern'], re.IGNORECASE)
+            pattern_info['renderer'] = _make_template_renderer(pattern_info['template'])
+        return patterns
     
     def _create_generic_query(self, description: str) -> str:
         """Create a basic generic query when all else fails"""
@@ -355,34 +662,35 @@ Return ONLY the SQL query, no explanations or markdown formatting.
     
     def _parse_schema(self, schema_ddl: str) -> Dict:
         """Parse schema DDL (reused from optimizer)"""
-        schema_info = {'tables': {}, 'indexes': []}
-        
-        # Simple regex-based parsing for CREATE TABLE statements
-        table_pattern = r'CREATE TABLE\s+(\w+)\s*\((.*?)\)'
-        
-        for match in re.finditer(table_pattern, schema_ddl, re.DOTALL | re.IGNORECASE):
-            table_name = match.group(1).lower()
-            columns_str = match.group(2)
-            
-            columns = []
-            # Extract column definitions
-            column_lines = [line.strip() for line in columns_str.split(',')]
-            for line in column_lines:
-                if line:
-                    parts = line.split()
-                    if parts:
-                        column_name = parts[0].lower()
-                        column_type = parts[1] if len(parts) > 1 else 'unknown'
-                        is_primary = 'primary' in line.lower() and 'key' in line.lower()
-                        columns.append({
-                            'name': column_name,
-                            'type': column_type,
-                            'is_primary': is_primary
-                        })
-            
-            schema_info['tables'][table_name] = {'columns': columns}
-        
-        return schema_info
+        return _parse_schema_cached(schema_ddl)
+
+@lru_cache(maxsize=32)
+def _parse_schema_cached(schema_ddl: str) -> Dict:
+    """Parse CREATE TABLE DDL, memoized so repeated set_schema calls are O(1)"""
+    schema_info = {'tables': {}, 'indexes': []}
+
+    # Simple regex-based parsing for CREATE TABLE statements
+    for match in _TABLE_DDL_RE.finditer(schema_ddl):
+        table_name = sys.intern(match.group(1).lower())
+        columns_str = match.group(2)
+
+        columns = []
+        # Extract column definitions in one regex pass instead of the
+        # split/strip/split-per-line dance; table-level constraint rows
+        # (PRIMARY KEY (...), FOREIGN KEY ...) are filtered by name
+        for col in _COL_RE.finditer(columns_str):
+            column_name = col.group(1).lower()
+            if column_name in _CONSTRAINT_KEYWORDS:
+                continue
+            columns.append({
+                'name': column_name,
+                'type': col.group(2),
+                'is_primary': _PK_RE.search(col.group(0)) is not None
+            })
+
+        schema_info['tables'][table_name] = {'columns': columns}
+
+    return schema_info
 
 # Usage example and testing
 if __name__ == "__main__":
@@ -7,26 +7,354 @@ performance improvement suggestions without external API dependencies.
 
 import re
 import sqlparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from sqlparse import sql, tokens as T
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Final, List, Dict, Tuple, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Every pattern used by the _check_* methods, compiled once at import.
+# The checks receive a _Ctx carrying the stringified query (raw and
+# lowered exactly once per analysis) and scan with these constants.
+_RE_LIKE_LEADING_WC: Final[re.Pattern] = re.compile(r"like\s+['\"]%")
+_RE_LIKE_BOTH_WC: Final[re.Pattern] = re.compile(r"like\s+['\"]%.*%['\"]")
+_RE_QUOTED_NUMBER: Final[re.Pattern] = re.compile(r"=\s*['\"][0-9]+['\"]")
+_RE_WHERE_COL: Final[re.Pattern] = re.compile(r'where\s+.*?(\w+)\.(\w+)\s*=')
+_RE_JOIN_ON: Final[re.Pattern] = re.compile(r'on\s+(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)')
+_RE_IN_SUBQUERY: Final[re.Pattern] = re.compile(r'in\s*\(\s*select')
+_RE_WHERE_JOIN: Final[re.Pattern] = re.compile(r'where.*?\w+\.\w+\s*=\s*\w+\.\w+')
+_RE_ORDER_BY_FUNC: Final[re.Pattern] = re.compile(r'order\s+by.*?\w+\s*\(')
+_RE_WHERE_COMPARISON: Final[re.Pattern] = re.compile(r'where.*?\w+\s*[<>=!]')
+_RE_NUM_STR_CMP: Final[re.Pattern] = re.compile(r"\w+\s*[<>=]\s*['\"]\d+['\"]|['\"]\d+['\"]\s*[<>=]\s*\w+")
+_RE_DATE_STR_CMP: Final[re.Pattern] = re.compile(
+    r"\w+\s*[<>=]\s*['\"]\d{4}-\d{2}-\d{2}['\"]|['\"]\d{4}-\d{2}-\d{2}['\"]\s*[<>=]\s*\w+")
+_RE_NESTED_AGG: Final[re.Pattern] = re.compile(r'\b(count|sum|avg|min|max)\s*\(.*?\b(count|sum|avg|min|max)\s*\(')
+# All index-hostile functions in one alternation; the check scans the
+# region after WHERE once instead of running one pattern per function
+_FN_IN_WHERE: Final[re.Pattern] = re.compile(r'\b(upper|lower|substring|year|month|day)\s*\(')
+
+# Literal triggers behind the checks. One pass over the lowered query
+# (an Aho-Corasick scan when the library is present, plain substring
+# probes otherwise) records which literals occur; checks whose trigger
+# is absent return immediately without touching the string again.
+_TRIGGER_LITERALS = (
+    'select *', 'select distinct', 'select', 'where', 'limit', 'top',
+    'like', 'join', 'exists', 'in', 'order by', 'group by', 'having',
+    'union all', 'union', 'is null', 'is not null', 'distinct',
+    'count(*)', 'count(', 'sum(', 'avg(', 'min(', 'max('
+)
+_AGG_LITERALS = frozenset({'count(', 'sum(', 'avg(', 'min(', 'max('})
+
+if AHOCORASICK_AVAILABLE:
+    _TRIGGER_AUTOMATON = ahocorasick.Automaton()
+    for _lit in _TRIGGER_LITERALS:
+        _TRIGGER_AUTOMATON.add_word(_lit, _lit)
+    _TRIGGER_AUTOMATON.make_automaton()
+else:
+    _TRIGGER_AUTOMATON = None
+
+def _literal_hits(lower: str) -> frozenset:
+    """Collect which trigger literals occur in the lowered query
+
+    Both branches keep the per-byte work inside compiled code: the
+    Aho-Corasick walk is a C automaton, and the fallback drives
+    str.__contains__ (C memmem) through filter without re-entering the
+    interpreter between probes.
+    """
+    if _TRIGGER_AUTOMATON is not None:
+        return frozenset(lit for _, lit in _TRIGGER_AUTOMATON.iter(lower))
+    return frozenset(filter(lower.__contains__, _TRIGGER_LITERALS))
+
+# Presence-only patterns (no capture groups needed) keyed by name, with a
+# flag for whether the original check scanned the raw or lowered string.
+# With python-hyperscan installed they all compile into one database that
+# is scanned once per analysis; otherwise each check falls back to its
+# individual compiled pattern.
+_CHECK_RES = {
+    'like_leading_wc': (_RE_LIKE_LEADING_WC, False),
+    'like_both_wc': (_RE_LIKE_BOTH_WC, False),
+    'quoted_number': (_RE_QUOTED_NUMBER, True),
+    'in_subquery': (_RE_IN_SUBQUERY, False),
+    'order_by_func': (_RE_ORDER_BY_FUNC, False),
+    'where_comparison': (_RE_WHERE_COMPARISON, False),
+    'num_str_cmp': (_RE_NUM_STR_CMP, True),
+    'date_str_cmp': (_RE_DATE_STR_CMP, True),
+    'nested_agg': (_RE_NESTED_AGG, False),
+}
+_HS_CHECK_KEYS = tuple(_CHECK_RES)
+
+if HYPERSCAN_AVAILABLE:
+    _HS_CHECK_DB = hyperscan.Database()
+    _HS_CHECK_DB.compile(
+        expressions=[_CHECK_RES[k][0].pattern.encode() for k in _HS_CHECK_KEYS],
+        ids=list(range(len(_HS_CHECK_KEYS))),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(_HS_CHECK_KEYS)
+    )
+else:
+    _HS_CHECK_DB = None
+
+def _hs_check_hits(raw: str):
+    """Run all presence patterns in one hyperscan pass, or defer to re"""
+    if _HS_CHECK_DB is None:
+        return None
+    ids = set()
+    _HS_CHECK_DB.scan(
+        raw.encode(),
+        match_event_handler=lambda pid, start, end, flags, ctx: ids.add(pid)
+    )
+    return frozenset(_HS_CHECK_KEYS[i] for i in ids)
+
 class OptimizationLevel(Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
     CRITICAL = "critical"
 
-@dataclass
+# Score penalty per severity level, resolved once at construction so the
+# scoring loop is a plain integer sum instead of an enum comparison chain
+_LEVEL_WEIGHTS = {
+    OptimizationLevel.CRITICAL: 25,
+    OptimizationLevel.HIGH: 15,
+    OptimizationLevel.MEDIUM: 10,
+    OptimizationLevel.LOW: 5,
+}
+
+@dataclass(frozen=True, slots=True)
 class OptimizationSuggestion:
-    """Represents a single optimization suggestion"""
+    """Represents a single optimization suggestion
+
+    Frozen so the fully static suggestions below can be shared across
+    all analyses instead of being rebuilt per query.
+
+    optimized_query may hold either the rewritten query or a zero-argument
+    callable producing it; checks pass a callable so the rewrite string is
+    only built for results that are actually rendered. Readers go through
+    resolve_optimized_query, which materializes and caches the string.
+    """
     level: OptimizationLevel
     category: str
     issue: str
     suggestion: str
-    optimized_query: Optional[str] = None
+    optimized_query: Union[str, Callable[[], str], None] = None
     index_recommendation: Optional[str] = None
+    level_weight: int = 0
+
+    def __post_init__(self):
+        if self.level_weight == 0:
+            # frozen dataclass, so bypass the immutability guard here
+            object.__setattr__(self, 'level_weight', _LEVEL_WEIGHTS[self.level])
+
+    def resolve_optimized_query(self) -> Optional[str]:
+        """Return the rewritten query, building it on first access"""
+        q = self.optimized_query
+        if callable(q):
+            q = q()
+            object.__setattr__(self, 'optimized_query', q)
+        return q
+
+# Shared instances for every suggestion whose text is fixed; checks with
+# dynamic fields (a join count, a rewritten query) still allocate.
+_SUG_MISSING_WHERE = OptimizationSuggestion(
+    level=OptimizationLevel.HIGH,
+    category="Data Filtering",
+    issue="Query lacks WHERE clause and may return all rows",
+    suggestion="Add appropriate WHERE conditions to limit the result set and improve performance"
+)
+_SUG_LIKE_LEADING_WC = OptimizationSuggestion(
+    level=OptimizationLevel.HIGH,
+    category="Index Usage",
+    issue="LIKE with leading wildcard (%) prevents index usage",
+    suggestion="Consider using full-text search or restructuring the query to avoid leading wildcards"
+)
+_SUG_IMPLICIT_CONVERSION = OptimizationSuggestion(
+    level=OptimizationLevel.LOW,
+    category="Data Types",
+    issue="Potential implicit conversion between string and numeric types",
+    suggestion="Ensure data types match to avoid implicit conversions that can prevent index usage"
+)
+_SUG_EXISTS_SUBQUERY = OptimizationSuggestion(
+    level=OptimizationLevel.MEDIUM,
+    category="Query Structure",
+    issue="EXISTS subquery detected",
+    suggestion="Consider converting EXISTS subquery to JOIN for better performance in some cases"
+)
+_SUG_IN_SUBQUERY = OptimizationSuggestion(
+    level=OptimizationLevel.MEDIUM,
+    category="Query Structure",
+    issue="IN with subquery detected",
+    suggestion="Consider using JOIN or EXISTS instead of IN with subquery for better performance"
+)
+_SUG_ORDER_BY_NO_LIMIT = OptimizationSuggestion(
+    level=OptimizationLevel.LOW,
+    category="Data Retrieval",
+    issue="ORDER BY without LIMIT may sort unnecessary rows",
+    suggestion="If you don't need all sorted results, consider adding LIMIT to reduce sorting overhead"
+)
+_SUG_LIKE_BOTH_WC = OptimizationSuggestion(
+    level=OptimizationLevel.MEDIUM,
+    category="Search Optimization",
+    issue="LIKE with wildcards on both ends requires full table scan",
+    suggestion="Consider using full-text search capabilities for better performance on text searches"
+)
+_SUG_DISTINCT_AGG = OptimizationSuggestion(
+    level=OptimizationLevel.MEDIUM,
+    category="Query Structure",
+    issue="DISTINCT used with aggregation functions may be redundant",
+    suggestion="Review if DISTINCT is necessary when using aggregation functions"
+)
+_SUG_DISTINCT_ORDER_BY = OptimizationSuggestion(
+    level=OptimizationLevel.LOW,
+    category="Query Structure",
+    issue="DISTINCT with ORDER BY can be expensive",
+    suggestion="Consider using GROUP BY instead of DISTINCT when ordering results"
+)
+_SUG_CARTESIAN = OptimizationSuggestion(
+    level=OptimizationLevel.CRITICAL,
+    category="Query Structure",
+    issue="Potential cartesian product detected - multiple tables without JOIN conditions",
+    suggestion="Add proper JOIN conditions or WHERE clauses to avoid cartesian products"
+)
+_SUG_MULTI_ORDER_BY = OptimizationSuggestion(
+    level=OptimizationLevel.MEDIUM,
+    category="Performance",
+    issue="Multiple ORDER BY clauses detected",
+    suggestion="Remove ORDER BY from subqueries unless absolutely necessary"
+)
+_SUG_ORDER_BY_FUNC = OptimizationSuggestion(
+    level=OptimizationLevel.MEDIUM,
+    category="Index Usage",
+    issue="ORDER BY uses functions which prevents index usage",
+    suggestion="Consider creating computed columns or functional indexes"
+)
+_SUG_NULL_HANDLING = OptimizationSuggestion(
+    level=OptimizationLevel.LOW,
+    category="Data Integrity",
+    issue="Consider NULL handling in WHERE conditions",
+    suggestion="Explicitly handle NULL values with IS NULL or IS NOT NULL clauses where appropriate"
+)
+_SUG_NUM_STR_CMP = OptimizationSuggestion(
+    level=OptimizationLevel.MEDIUM,
+    category="Data Types",
+    issue="Potential data type mismatch between string and numeric values",
+    suggestion="Ensure consistent data types in comparisons to avoid implicit conversions"
+)
+_SUG_DATE_STR_CMP = OptimizationSuggestion(
+    level=OptimizationLevel.LOW,
+    category="Data Types",
+    issue="String comparison with date format detected",
+    suggestion="Use proper date functions like DATE() for date comparisons"
+)
+_SUG_COUNT_STAR = OptimizationSuggestion(
+    level=OptimizationLevel.LOW,
+    category="Performance",
+    issue="COUNT(*) without WHERE clause may be slow on large tables",
+    suggestion="Consider using table statistics or adding WHERE conditions to limit the count"
+)
+_SUG_NESTED_AGG = OptimizationSuggestion(
+    level=OptimizationLevel.HIGH,
+    category="Query Structure",
+    issue="Nested aggregation functions detected",
+    suggestion="Break down complex aggregations into multiple queries or use window functions"
+)
+_SUG_AGG_NO_GROUP_BY = OptimizationSuggestion(
+    level=OptimizationLevel.LOW,
+    category="Query Structure",
+    issue="Mixing aggregate and non-aggregate columns may require GROUP BY",
+    suggestion="Ensure all non-aggregate columns in SELECT are included in GROUP BY clause"
+)
+
+@dataclass
+class _Features:
+    """Structured view of one parse tree, built in a single flatten() walk
+
+    Token-level flags replace the old substring heuristics, which also
+    stops literals like 'hello where' inside strings from fooling checks.
+    """
+    tokens: frozenset
+    has_where: bool
+    has_order_by: bool
+    has_group_by: bool
+    has_having: bool
+    join_count: int
+    select_count: int
+    and_or_count: int
+    from_count: int
+    order_by_count: int
+
+def _extract_features(parsed) -> _Features:
+    """Walk the token stream once and collect everything the checks need"""
+    tokens = set()
+    has_where = has_group_by = has_having = False
+    join_count = select_count = and_or_count = 0
+    from_count = order_by_count = 0
+    pending_from = False
+    for tok in parsed.flatten():
+        ttype = tok.ttype
+        if pending_from and not tok.is_whitespace:
+            # Count only FROM clauses that introduce a table reference;
+            # a parenthesis here opens a derived table, which the old
+            # \bfrom\s+\w+ count never matched
+            if tok.value != '(':
+                from_count += 1
+            pending_from = False
+        if ttype in T.Keyword or ttype in T.Comparison:
+            val = ' '.join(tok.value.lower().split())
+            tokens.add(val)
+            if val == 'where':
+                has_where = True
+            elif val == 'order by':
+                order_by_count += 1
+            elif val == 'group by':
+                has_group_by = True
+            elif val == 'having':
+                has_having = True
+            elif val == 'select':
+                select_count += 1
+            elif val in ('and', 'or'):
+                and_or_count += 1
+            elif val == 'from':
+                pending_from = True
+            elif val.endswith('join'):
+                join_count += 1
+    return _Features(frozenset(tokens), has_where, order_by_count > 0,
+                     has_group_by, has_having, join_count, select_count,
+                     and_or_count, from_count, order_by_count)
+
+@dataclass
+class _Ctx:
+    """Per-analysis context shared by all checks
+
+    The stringified query is built and lowered exactly once here instead
+    of once per check.
+    """
+    parsed: any
+    raw: str
+    lower: str
+    hits: frozenset
+    features: _Features = None
+    hs_hits: Optional[frozenset] = None
+    has_aggregate: bool = False
+
+    def re_hit(self, key: str) -> bool:
+        """Did the named presence pattern fire for this query?"""
+        if self.hs_hits is not None:
+            return key in self.hs_hits
+        pattern, use_raw = _CHECK_RES[key]
+        return pattern.search(self.raw if use_raw else self.lower) is not None
 
 @dataclass
 class QueryAnalysisResult:
@@ -36,49 +364,207 @@ class QueryAnalysisResult:
     performance_score: int  # 0-100 (higher is better)
     complexity_analysis: Dict[str, any]
 
+# Deferred query-rewrite builders. Module-level (and wrapped in partial
+# rather than a lambda) so suggestions stay picklable for the process-pool
+# batch path.
+def _suggest_specific_columns(query: str) -> str:
+    # This is a simplified example - in practice, you'd need schema info
+    return query.replace('SELECT *', 'SELECT column1, column2, column3  -- Replace with actual column names')
+
+def _rewrite_union_all(query: str) -> str:
+    return query.replace('UNION', 'UNION ALL')
+
+def _split_columns(body: str) -> List[str]:
+    """Split a column-list body on commas at parenthesis depth zero
+
+    A plain split(',') breaks on VARCHAR(50), DECIMAL(10,2) and CHECK
+    constraints; this scanner tracks nesting so those stay intact.
+    """
+    parts = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(body):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(body[start:i].strip())
+            start = i + 1
+    parts.append(body[start:].strip())
+    return parts
+
+@lru_cache(maxsize=32)
+def _parse_schema_cached(schema_ddl: str) -> Dict:
+    """Parse CREATE TABLE statements out of a DDL string, memoized on the text
+
+    Walks the sqlparse token tree instead of regex-matching the raw DDL, so
+    nested parentheses in column types and constraints parse correctly and
+    large schemas avoid DOTALL backtracking. Identical DDL always yields
+    identical structure, so the result is cached at module level; callers
+    must treat the returned dict as read-only.
+    """
+    schema_info = {'tables': {}, 'indexes': []}
+
+    for stmt in sqlparse.parse(schema_ddl):
+        if stmt.get_type() != 'CREATE':
+            continue
+
+        # Find the table name (first Identifier after TABLE) and its
+        # column-list Parenthesis; sqlparse occasionally groups both
+        # into a Function node, so look inside those too
+        table_name = None
+        paren = None
+        for tok in stmt.tokens:
+            if isinstance(tok, sql.Function):
+                name_tok = tok.token_first(skip_cm=True)
+                if name_tok is not None:
+                    table_name = name_tok.value.lower()
+                paren = next((t for t in tok.tokens if isinstance(t, sql.Parenthesis)), None)
+                break
+            if isinstance(tok, sql.Identifier) and table_name is None:
+                table_name = tok.get_real_name().lower()
+            elif isinstance(tok, sql.Parenthesis):
+                paren = tok
+                break
+        if table_name is None or paren is None:
+            continue
+
+        columns = []
+        for line in _split_columns(str(paren)[1:-1]):
+            parts = line.split()
+            if not parts:
+                continue
+            column_name = parts[0].lower()
+            column_type = parts[1] if len(parts) > 1 else 'unknown'
+            is_primary = 'primary' in line.lower() and 'key' in line.lower()
+            columns.append({
+                'name': column_name,
+                'type': column_type,
+                'is_primary': is_primary
+            })
+
+        schema_info['tables'][table_name] = {'columns': columns}
+
+    return schema_info
+
 class SQLOptimizerEngine:
     """Main SQL optimization engine"""
     
     def __init__(self):
         self.schema_info = {}
         self.optimization_rules = self._load_optimization_rules()
-    
+        # Bumped whenever the schema changes; keyed into the analysis cache
+        # so stale results die with the DDL that produced them
+        self._schema_version = 0
+        # Bound methods resolved once; _analyze_cached just walks this tuple
+        # instead of doing an attribute lookup per check per query
+        self._checks = (
+            self._check_select_star,
+            self._check_missing_where_clause,
+            self._check_non_sargable_predicates,
+            self._check_function_in_where,
+            self._check_implicit_conversions,
+            self._check_unnecessary_joins,
+            self._check_missing_indexes,
+            self._check_subquery_optimization,
+            self._check_order_by_without_limit,
+            self._check_like_wildcards,
+            self._check_distinct_usage,
+            self._check_union_vs_union_all,
+            self._check_cartesian_products,
+            self._check_unnecessary_sorting,
+            self._check_nullable_columns,
+            self._check_data_type_mismatches,
+            self._check_inefficient_aggregations,
+        )
+
     def set_schema(self, schema_ddl: str):
         """Parse and store database schema information"""
         self.schema_info = self._parse_schema(schema_ddl)
-    
+        self._schema_version += 1
+
+    def parse_schema(self, schema_ddl: str) -> Dict:
+        """Parse schema DDL without installing it, so callers can cache the result"""
+        return self._parse_schema(schema_ddl)
+
+    def install_parsed_schema(self, schema_info: Dict):
+        """Install an already-parsed schema, skipping the DDL re-parse"""
+        self.schema_info = schema_info
+        self._schema_version += 1
+
+    def clear_cache(self):
+        """Drop all memoized analysis results"""
+        self._analyze_cached.cache_clear()
+
+    def warmup(self):
+        """Run one representative analysis to prime sqlparse and the regex cache
+
+        Call this once at startup so the first real user request doesn't pay
+        the one-time parser initialization and pattern compilation cost.
+        """
+        self.analyze_query(
+            "SELECT u.username, COUNT(o.order_id) AS order_count "
+            "FROM users u JOIN orders o ON u.user_id = o.user_id "
+            "WHERE u.status = 'active' GROUP BY u.username ORDER BY order_count DESC"
+        )
+
     def analyze_query(self, query: str) -> QueryAnalysisResult:
-        """Analyze a SQL query and provide optimization suggestions"""
-        # Parse the SQL query
+        """Analyze a SQL query and provide optimization suggestions
+
+        Results are memoized on the whitespace-normalized query text, so a
+        warm workload pays only a dict lookup instead of a sqlparse pass
+        plus 17 checks. The schema version rides along in the key to keep
+        results from outliving the DDL they were computed against.
+        """
+        # Collapsing newlines would let a -- comment swallow the rest of
+        # the query, so comments are stripped before normalizing; the
+        # format pass only runs when a comment marker is actually present
+        if '--' in query or '/*' in query:
+            query = sqlparse.format(query, strip_comments=True)
+        # str.split/join normalizes whitespace entirely in C, without
+        # regex machinery
+        normalized = ' '.join(query.split())
+        return self._analyze_cached(normalized, self._schema_version)
+
+    def analyze_queries_batch(self, queries: List[str], workers: int = None) -> List[QueryAnalysisResult]:
+        """Analyze many queries in parallel across worker processes
+
+        The analysis is CPU-bound on sqlparse and the regex checks, so for
+        offline corpus work this fans out one query per task; each worker
+        builds its own engine once (with this engine's schema) and reuses
+        it for its whole share of the batch. Order of results matches the
+        input order.
+        """
+        with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                                 initargs=(self.schema_info,)) as executor:
+            return list(executor.map(_worker_analyze, queries, chunksize=32))
+
+    @lru_cache(maxsize=1024)
+    def _analyze_cached(self, query: str, schema_version: int) -> QueryAnalysisResult:
+        # Parse the SQL query; stringify and lower it once for every check
         parsed = sqlparse.parse(query)[0]
-        
+        raw = str(parsed)
+        lower = raw.lower()
+        hits = _literal_hits(lower)
+        ctx = _Ctx(parsed=parsed, raw=raw, lower=lower,
+                   hits=hits, features=_extract_features(parsed),
+                   hs_hits=_hs_check_hits(raw),
+                   has_aggregate=not hits.isdisjoint(_AGG_LITERALS))
+
         suggestions = []
-        complexity_analysis = {}
-        
+
         # Run all optimization checks
-        suggestions.extend(self._check_select_star(parsed))
-        suggestions.extend(self._check_missing_where_clause(parsed))
-        suggestions.extend(self._check_non_sargable_predicates(parsed))
-        suggestions.extend(self._check_function_in_where(parsed))
-        suggestions.extend(self._check_implicit_conversions(parsed))
-        suggestions.extend(self._check_unnecessary_joins(parsed))
-        suggestions.extend(self._check_missing_indexes(parsed))
-        suggestions.extend(self._check_subquery_optimization(parsed))
-        suggestions.extend(self._check_order_by_without_limit(parsed))
-        suggestions.extend(self._check_like_wildcards(parsed))
-        suggestions.extend(self._check_distinct_usage(parsed))
-        suggestions.extend(self._check_union_vs_union_all(parsed))
-        suggestions.extend(self._check_cartesian_products(parsed))
-        suggestions.extend(self._check_unnecessary_sorting(parsed))
-        suggestions.extend(self._check_nullable_columns(parsed))
-        suggestions.extend(self._check_data_type_mismatches(parsed))
-        suggestions.extend(self._check_inefficient_aggregations(parsed))
-        
+        for check in self._checks:
+            found = check(ctx)
+            if found:
+                suggestions.extend(found)
+
         # Calculate performance score
         performance_score = self._calculate_performance_score(suggestions)
-        
+
         # Analyze complexity
-        complexity_analysis = self._analyze_complexity(parsed)
+        complexity_analysis = self._analyze_complexity(ctx)
         
         return QueryAnalysisResult(
             original_query=query,
@@ -87,6 +573,10 @@ class SQLOptimizerEngine:
             complexity_analysis=complexity_analysis
         )
     
+    def session(self, query: str) -> "QuerySession":
+        """Open a QuerySession sharing one analysis across analyze/optimized/report"""
+        return QuerySession(self, query)
+
     def generate_optimized_query(self, query: str) -> str:
         """Generate an optimized version of the query"""
         analysis = self.analyze_query(query)
@@ -95,439 +585,270 @@ class SQLOptimizerEngine:
         # Apply automatic optimizations
         for suggestion in analysis.suggestions:
             if suggestion.optimized_query:
-                optimized = suggestion.optimized_query
+                optimized = suggestion.resolve_optimized_query()
                 break  # Apply the first available optimization
         
         return optimized
     
     def _parse_schema(self, schema_ddl: str) -> Dict:
-        """Parse schema DDL to extract table and column information"""
-        schema_info = {'tables': {}, 'indexes': []}
-        
-        # Simple regex-based parsing for CREATE TABLE statements
-        table_pattern = r'CREATE TABLE\s+(\w+)\s*\((.*?)\)'
-        
-        for match in re.finditer(table_pattern, schema_ddl, re.DOTALL | re.IGNORECASE):
-            table_name = match.group(1).lower()
-            columns_str = match.group(2)
-            
-            columns = []
-            # Extract column definitions
-            column_lines = [line.strip() for line in columns_str.split(',')]
-            for line in column_lines:
-                if line:
-                    parts = line.split()
-                    if parts:
-                        column_name = parts[0].lower()
-                        column_type = parts[1] if len(parts) > 1 else 'unknown'
-                        is_primary = 'primary' in line.lower() and 'key' in line.lower()
-                        columns.append({
-                            'name': column_name,
-                            'type': column_type,
-                            'is_primary': is_primary
-                        })
-            
-            schema_info['tables'][table_name] = {'columns': columns}
-        
-        return schema_info
-    
-    def _check_select_star(self, parsed) -> List[OptimizationSuggestion]:
+        """Parse schema DDL to extract table and column information
+
+        Delegates to a memoized module-level parser so repeated calls with
+        the same DDL (schema re-installs, multiple engine instances) reuse
+        the parsed structure instead of re-scanning the text.
+        """
+        return _parse_schema_cached(schema_ddl)
+
+    def _check_select_star(self, ctx: _Ctx) -> tuple:
         """Check for SELECT * usage"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        if 'select *' in query_str:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.MEDIUM,
-                category="Column Selection",
-                issue="Using SELECT * retrieves all columns",
-                suggestion="Specify only the columns you need to reduce data transfer and improve performance",
-                optimized_query=self._suggest_specific_columns(str(parsed))
-            ))
-        
-        return suggestions
+        if 'select *' not in ctx.hits:
+            return ()
+        return (OptimizationSuggestion(
+            level=OptimizationLevel.MEDIUM,
+            category="Column Selection",
+            issue="Using SELECT * retrieves all columns",
+            suggestion="Specify only the columns you need to reduce data transfer and improve performance",
+            optimized_query=partial(_suggest_specific_columns, ctx.raw)
+        ),)
     
-    def _check_missing_where_clause(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_missing_where_clause(self, ctx: _Ctx) -> tuple:
         """Check for queries without WHERE clauses"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
         # Check if it's a SELECT without WHERE
-        if 'select' in query_str and 'where' not in query_str and 'limit' not in query_str:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.HIGH,
-                category="Data Filtering",
-                issue="Query lacks WHERE clause and may return all rows",
-                suggestion="Add appropriate WHERE conditions to limit the result set and improve performance"
-            ))
-        
-        return suggestions
+        f = ctx.features
+        if 'select' in f.tokens and not f.has_where and 'limit' not in f.tokens:
+            return (_SUG_MISSING_WHERE,)
+        return ()
     
-    def _check_non_sargable_predicates(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_non_sargable_predicates(self, ctx: _Ctx) -> tuple:
         """Check for non-SARGable predicates that prevent index usage"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        # Check for leading wildcards in LIKE
-        if re.search(r"like\s+['\"]%", query_str):
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.HIGH,
-                category="Index Usage",
-                issue="LIKE with leading wildcard (%) prevents index usage",
-                suggestion="Consider using full-text search or restructuring the query to avoid leading wildcards"
-            ))
-        
-        return suggestions
+        # Check for leading wildcards in LIKE; skip the scan when LIKE is absent
+        if 'like' in ctx.features.tokens and ctx.re_hit('like_leading_wc'):
+            return (_SUG_LIKE_LEADING_WC,)
+        return ()
     
-    def _check_function_in_where(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_function_in_where(self, ctx: _Ctx) -> tuple:
         """Check for functions applied to columns in WHERE clauses"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        # Common functions that prevent index usage
-        functions = ['upper', 'lower', 'substring', 'year', 'month', 'day']
-        
-        for func in functions:
-            if re.search(rf'where.*{func}\s*\(', query_str):
-                suggestions.append(OptimizationSuggestion(
-                    level=OptimizationLevel.MEDIUM,
-                    category="Index Usage",
-                    issue=f"Function {func.upper()}() in WHERE clause prevents index usage",
-                    suggestion=f"Consider using computed columns or restructuring to avoid {func.upper()}() in WHERE clause"
-                ))
-        
-        return suggestions
+        if not ctx.features.has_where:
+            return ()
+
+        # Common functions that prevent index usage; one alternation pass
+        # over everything after WHERE replaces the old per-function scans
+        out = ()
+        seen = set()
+        for m in _FN_IN_WHERE.finditer(ctx.lower, ctx.lower.find('where')):
+            func = m.group(1)
+            if func in seen:
+                continue
+            seen.add(func)
+            out += (OptimizationSuggestion(
+                level=OptimizationLevel.MEDIUM,
+                category="Index Usage",
+                issue=f"Function {func.upper()}() in WHERE clause prevents index usage",
+                suggestion=f"Consider using computed columns or restructuring to avoid {func.upper()}() in WHERE clause"
+            ),)
+
+        return out
     
-    def _check_implicit_conversions(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_implicit_conversions(self, ctx: _Ctx) -> tuple:
         """Check for potential implicit data type conversions"""
-        suggestions = []
-        query_str = str(parsed)
-        
-        # Look for quoted numbers (potential string to number conversion)
-        if re.search(r"=\s*['\"][0-9]+['\"]", query_str):
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.LOW,
-                category="Data Types",
-                issue="Potential implicit conversion between string and numeric types",
-                suggestion="Ensure data types match to avoid implicit conversions that can prevent index usage"
-            ))
-        
-        return suggestions
+        # Look for quoted numbers (potential string to number conversion);
+        # no quote in the query means nothing to scan for
+        if "'" in ctx.raw and ctx.re_hit('quoted_number'):
+            return (_SUG_IMPLICIT_CONVERSION,)
+        return ()
     
-    def _check_unnecessary_joins(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_unnecessary_joins(self, ctx: _Ctx) -> tuple:
         """Check for potentially unnecessary joins"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        # Count joins
-        join_count = len(re.findall(r'\bjoin\b', query_str))
-        
-        if join_count > 3:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.MEDIUM,
-                category="Query Structure",
-                issue=f"Query has {join_count} joins which may impact performance",
-                suggestion="Review if all joins are necessary. Consider breaking complex queries into simpler ones or using CTEs"
-            ))
-        
-        return suggestions
+        join_count = ctx.features.join_count
+        if join_count <= 3:
+            return ()
+        return (OptimizationSuggestion(
+            level=OptimizationLevel.MEDIUM,
+            category="Query Structure",
+            issue=f"Query has {join_count} joins which may impact performance",
+            suggestion="Review if all joins are necessary. Consider breaking complex queries into simpler ones or using CTEs"
+        ),)
     
-    def _check_missing_indexes(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_missing_indexes(self, ctx: _Ctx) -> tuple:
         """Suggest indexes based on WHERE and JOIN conditions"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        # Extract table and column names from WHERE conditions
-        where_matches = re.findall(r'where\s+.*?(\w+)\.(\w+)\s*=', query_str)
-        join_matches = re.findall(r'on\s+(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)', query_str)
-        
-        recommended_indexes = set()
-        
-        # Suggest indexes for WHERE conditions
-        for table, column in where_matches:
-            index_name = f"idx_{table}_{column}"
-            recommended_indexes.add(f"CREATE INDEX {index_name} ON {table}({column});")
-        
-        # Suggest indexes for JOIN conditions
-        for t1, c1, t2, c2 in join_matches:
-            index1 = f"idx_{t1}_{c1}"
-            index2 = f"idx_{t2}_{c2}"
-            recommended_indexes.add(f"CREATE INDEX {index1} ON {t1}({c1});")
-            recommended_indexes.add(f"CREATE INDEX {index2} ON {t2}({c2});")
-        
-        if recommended_indexes:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.HIGH,
-                category="Indexing",
-                issue="Query may benefit from additional indexes",
-                suggestion="Consider creating the following indexes to improve query performance",
-                index_recommendation="\n".join(recommended_indexes)
-            ))
-        
-        return suggestions
+        if not ctx.features.has_where and ctx.features.join_count == 0:
+            return ()
+
+        # Collect (table, column) pairs first so duplicates are dropped
+        # before any DDL string is formatted, then sort for stable output
+        idx_keys = set(_RE_WHERE_COL.findall(ctx.lower))
+        for t1, c1, t2, c2 in _RE_JOIN_ON.findall(ctx.lower):
+            idx_keys.add((t1, c1))
+            idx_keys.add((t2, c2))
+
+        if not idx_keys:
+            return ()
+        return (OptimizationSuggestion(
+            level=OptimizationLevel.HIGH,
+            category="Indexing",
+            issue="Query may benefit from additional indexes",
+            suggestion="Consider creating the following indexes to improve query performance",
+            index_recommendation="\n".join(
+                f"CREATE INDEX idx_{t}_{c} ON {t}({c});" for t, c in sorted(idx_keys))
+        ),)
     
-    def _check_subquery_optimization(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_subquery_optimization(self, ctx: _Ctx) -> tuple:
         """Check for subqueries that could be optimized"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
+        out = ()
+
         # Check for EXISTS subqueries that could be JOINs
-        if 'exists' in query_str and 'select' in query_str:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.MEDIUM,
-                category="Query Structure",
-                issue="EXISTS subquery detected",
-                suggestion="Consider converting EXISTS subquery to JOIN for better performance in some cases"
-            ))
-        
+        if 'exists' in ctx.features.tokens and 'select' in ctx.features.tokens:
+            out += (_SUG_EXISTS_SUBQUERY,)
+
         # Check for IN with subqueries
-        if re.search(r'in\s*\(\s*select', query_str):
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.MEDIUM,
-                category="Query Structure",
-                issue="IN with subquery detected",
-                suggestion="Consider using JOIN or EXISTS instead of IN with subquery for better performance"
-            ))
-        
-        return suggestions
+        if 'in' in ctx.features.tokens and ctx.re_hit('in_subquery'):
+            out += (_SUG_IN_SUBQUERY,)
+
+        return out
     
-    def _check_order_by_without_limit(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_order_by_without_limit(self, ctx: _Ctx) -> tuple:
         """Check for ORDER BY without LIMIT"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        if 'order by' in query_str and 'limit' not in query_str and 'top' not in query_str:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.LOW,
-                category="Data Retrieval",
-                issue="ORDER BY without LIMIT may sort unnecessary rows",
-                suggestion="If you don't need all sorted results, consider adding LIMIT to reduce sorting overhead"
-            ))
-        
-        return suggestions
+        f = ctx.features
+        if f.has_order_by and 'limit' not in f.tokens and 'top' not in f.tokens:
+            return (_SUG_ORDER_BY_NO_LIMIT,)
+        return ()
     
-    def _check_like_wildcards(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_like_wildcards(self, ctx: _Ctx) -> tuple:
         """Check for inefficient LIKE patterns"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
         # Check for patterns that start and end with wildcards
-        if re.search(r"like\s+['\"]%.*%['\"]", query_str):
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.MEDIUM,
-                category="Search Optimization",
-                issue="LIKE with wildcards on both ends requires full table scan",
-                suggestion="Consider using full-text search capabilities for better performance on text searches"
-            ))
-        
-        return suggestions
+        if 'like' in ctx.features.tokens and ctx.re_hit('like_both_wc'):
+            return (_SUG_LIKE_BOTH_WC,)
+        return ()
     
-    def _check_distinct_usage(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_distinct_usage(self, ctx: _Ctx) -> tuple:
         """Check for unnecessary or inefficient DISTINCT usage"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        if 'select distinct' in query_str:
-            # Check if DISTINCT is used with aggregation functions
-            if any(func in query_str for func in ['count(', 'sum(', 'avg(', 'min(', 'max(']):
-                suggestions.append(OptimizationSuggestion(
-                    level=OptimizationLevel.MEDIUM,
-                    category="Query Structure",
-                    issue="DISTINCT used with aggregation functions may be redundant",
-                    suggestion="Review if DISTINCT is necessary when using aggregation functions"
-                ))
-            
-            # Suggest using GROUP BY instead of DISTINCT when possible
-            if 'order by' in query_str:
-                suggestions.append(OptimizationSuggestion(
-                    level=OptimizationLevel.LOW,
-                    category="Query Structure",
-                    issue="DISTINCT with ORDER BY can be expensive",
-                    suggestion="Consider using GROUP BY instead of DISTINCT when ordering results"
-                ))
-        
-        return suggestions
+        if 'select distinct' not in ctx.hits:
+            return ()
+
+        out = ()
+        # Check if DISTINCT is used with aggregation functions
+        if ctx.has_aggregate:
+            out += (_SUG_DISTINCT_AGG,)
+
+        # Suggest using GROUP BY instead of DISTINCT when possible
+        if ctx.features.has_order_by:
+            out += (_SUG_DISTINCT_ORDER_BY,)
+
+        return out
     
-    def _check_union_vs_union_all(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_union_vs_union_all(self, ctx: _Ctx) -> tuple:
         """Check for UNION usage where UNION ALL would be more efficient"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        if 'union' in query_str and 'union all' not in query_str:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.MEDIUM,
-                category="Query Structure",
-                issue="UNION removes duplicates which requires extra processing",
-                suggestion="Use UNION ALL if duplicates are acceptable or if you're certain there are no duplicates",
-                optimized_query=str(parsed).replace('UNION', 'UNION ALL')
-            ))
-        
-        return suggestions
+        # A bare UNION token can't be confused with UNION ALL at token level
+        if 'union' not in ctx.features.tokens:
+            return ()
+        return (OptimizationSuggestion(
+            level=OptimizationLevel.MEDIUM,
+            category="Query Structure",
+            issue="UNION removes duplicates which requires extra processing",
+            suggestion="Use UNION ALL if duplicates are acceptable or if you're certain there are no duplicates",
+            optimized_query=partial(_rewrite_union_all, ctx.raw)
+        ),)
     
-    def _check_cartesian_products(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_cartesian_products(self, ctx: _Ctx) -> tuple:
         """Check for potential cartesian products (missing JOIN conditions)"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        # Count tables and JOIN clauses
-        from_tables = len(re.findall(r'\bfrom\s+\w+', query_str))
-        join_clauses = len(re.findall(r'\bjoin\b', query_str))
-        where_joins = len(re.findall(r'where.*?\w+\.\w+\s*=\s*\w+\.\w+', query_str))
-        
-        # If we have multiple tables but no proper joins
-        if from_tables > 1 and join_clauses == 0 and where_joins == 0:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.CRITICAL,
-                category="Query Structure",
-                issue="Potential cartesian product detected - multiple tables without JOIN conditions",
-                suggestion="Add proper JOIN conditions or WHERE clauses to avoid cartesian products"
-            ))
-        
-        return suggestions
+        # An explicit JOIN clause rules the cartesian heuristic out up front,
+        # and a comma-free query can't list multiple tables in FROM
+        if ctx.features.join_count or ',' not in ctx.raw:
+            return ()
+
+        # Multiple FROM clauses (precomputed) with no WHERE join predicate
+        if (ctx.features.from_count > 1
+                and not _RE_WHERE_JOIN.search(ctx.lower)):
+            return (_SUG_CARTESIAN,)
+
+        return ()
     
-    def _check_unnecessary_sorting(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_unnecessary_sorting(self, ctx: _Ctx) -> tuple:
         """Check for multiple or unnecessary sorting operations"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
+        if not ctx.features.has_order_by:
+            return ()
+
+        out = ()
         # Check for ORDER BY in subqueries
-        if 'order by' in query_str:
-            # Count ORDER BY clauses
-            order_by_count = len(re.findall(r'order\s+by', query_str))
-            
-            if order_by_count > 1:
-                suggestions.append(OptimizationSuggestion(
-                    level=OptimizationLevel.MEDIUM,
-                    category="Performance",
-                    issue="Multiple ORDER BY clauses detected",
-                    suggestion="Remove ORDER BY from subqueries unless absolutely necessary"
-                ))
-            
-            # Check for ORDER BY with functions
-            if re.search(r'order\s+by.*?\w+\s*\(', query_str):
-                suggestions.append(OptimizationSuggestion(
-                    level=OptimizationLevel.MEDIUM,
-                    category="Index Usage",
-                    issue="ORDER BY uses functions which prevents index usage",
-                    suggestion="Consider creating computed columns or functional indexes"
-                ))
-        
-        return suggestions
+        if ctx.features.order_by_count > 1:
+            out += (_SUG_MULTI_ORDER_BY,)
+
+        # Check for ORDER BY with functions
+        if ctx.re_hit('order_by_func'):
+            out += (_SUG_ORDER_BY_FUNC,)
+
+        return out
     
-    def _check_nullable_columns(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_nullable_columns(self, ctx: _Ctx) -> tuple:
         """Check for operations on potentially nullable columns"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
-        # Check for comparisons that might not handle NULLs properly
-        if re.search(r'where.*?\w+\s*[<>=!]', query_str) and 'is null' not in query_str and 'is not null' not in query_str:
-            # This is a heuristic - in practice, you'd need schema information
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.LOW,
-                category="Data Integrity",
-                issue="Consider NULL handling in WHERE conditions",
-                suggestion="Explicitly handle NULL values with IS NULL or IS NOT NULL clauses where appropriate"
-            ))
-        
-        return suggestions
+        # Check for comparisons that might not handle NULLs properly;
+        # this is a heuristic - in practice, you'd need schema information
+        if (ctx.features.has_where and 'is null' not in ctx.hits
+                and 'is not null' not in ctx.hits
+                and ctx.re_hit('where_comparison')):
+            return (_SUG_NULL_HANDLING,)
+        return ()
     
-    def _check_data_type_mismatches(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_data_type_mismatches(self, ctx: _Ctx) -> tuple:
         """Check for potential data type mismatches that could cause performance issues"""
-        suggestions = []
-        query_str = str(parsed)
-        
+        # Both patterns look inside quoted literals; skip quote-free queries
+        if "'" not in ctx.raw:
+            return ()
+
+        out = ()
         # Check for comparing strings to numbers (more sophisticated than before)
-        if re.search(r"\w+\s*[<>=]\s*['\"]\d+['\"]|['\"]\d+['\"]\s*[<>=]\s*\w+", query_str):
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.MEDIUM,
-                category="Data Types",
-                issue="Potential data type mismatch between string and numeric values",
-                suggestion="Ensure consistent data types in comparisons to avoid implicit conversions"
-            ))
-        
+        if ctx.re_hit('num_str_cmp'):
+            out += (_SUG_NUM_STR_CMP,)
+
         # Check for date string comparisons
-        if re.search(r"\w+\s*[<>=]\s*['\"]\d{4}-\d{2}-\d{2}['\"]|['\"]\d{4}-\d{2}-\d{2}['\"]\s*[<>=]\s*\w+", query_str):
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.LOW,
-                category="Data Types",
-                issue="String comparison with date format detected",
-                suggestion="Use proper date functions like DATE() for date comparisons"
-            ))
-        
-        return suggestions
+        if ctx.re_hit('date_str_cmp'):
+            out += (_SUG_DATE_STR_CMP,)
+
+        return out
     
-    def _check_inefficient_aggregations(self, parsed) -> List[OptimizationSuggestion]:
+    def _check_inefficient_aggregations(self, ctx: _Ctx) -> tuple:
         """Check for inefficient aggregation patterns"""
-        suggestions = []
-        query_str = str(parsed).lower()
-        
+        out = ()
+
         # Check for COUNT(*) vs COUNT(column)
-        if 'count(*)' in query_str and 'where' not in query_str:
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.LOW,
-                category="Performance",
-                issue="COUNT(*) without WHERE clause may be slow on large tables",
-                suggestion="Consider using table statistics or adding WHERE conditions to limit the count"
-            ))
-        
+        if 'count(*)' in ctx.hits and not ctx.features.has_where:
+            out += (_SUG_COUNT_STAR,)
+
         # Check for nested aggregations
-        if re.search(r'\b(count|sum|avg|min|max)\s*\(.*?\b(count|sum|avg|min|max)\s*\(', query_str):
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.HIGH,
-                category="Query Structure",
-                issue="Nested aggregation functions detected",
-                suggestion="Break down complex aggregations into multiple queries or use window functions"
-            ))
-        
+        if ctx.has_aggregate and ctx.re_hit('nested_agg'):
+            out += (_SUG_NESTED_AGG,)
+
         # Check for aggregation without GROUP BY but with non-aggregate columns
-        has_aggregate = any(func in query_str for func in ['count(', 'sum(', 'avg(', 'min(', 'max('])
-        has_group_by = 'group by' in query_str
-        
-        if has_aggregate and not has_group_by:
+        if ctx.has_aggregate and not ctx.features.has_group_by:
             # This is a simplified check - in practice, you'd need to parse the SELECT list
-            suggestions.append(OptimizationSuggestion(
-                level=OptimizationLevel.LOW,
-                category="Query Structure",
-                issue="Mixing aggregate and non-aggregate columns may require GROUP BY",
-                suggestion="Ensure all non-aggregate columns in SELECT are included in GROUP BY clause"
-            ))
-        
-        return suggestions
+            out += (_SUG_AGG_NO_GROUP_BY,)
+
+        return out
     
     def _calculate_performance_score(self, suggestions: List[OptimizationSuggestion]) -> int:
         """Calculate a performance score based on issues found"""
-        base_score = 100
-        
-        for suggestion in suggestions:
-            if suggestion.level == OptimizationLevel.CRITICAL:
-                base_score -= 25
-            elif suggestion.level == OptimizationLevel.HIGH:
-                base_score -= 15
-            elif suggestion.level == OptimizationLevel.MEDIUM:
-                base_score -= 10
-            elif suggestion.level == OptimizationLevel.LOW:
-                base_score -= 5
-        
-        return max(0, base_score)
+        return max(0, 100 - sum(s.level_weight for s in suggestions))
     
-    def _analyze_complexity(self, parsed) -> Dict:
-        """Analyze query complexity"""
-        query_str = str(parsed).lower()
-        
+    def _analyze_complexity(self, ctx: _Ctx) -> Dict:
+        """Analyze query complexity from the precomputed token features
+
+        Everything here was already counted during the single flatten()
+        walk, so this is pure field access with no string scanning.
+        """
+        f = ctx.features
         return {
-            'join_count': len(re.findall(r'\bjoin\b', query_str)),
-            'subquery_count': len(re.findall(r'\bselect\b', query_str)) - 1,
-            'where_conditions': len(re.findall(r'\band\b|\bor\b', query_str)) + 1,
-            'has_order_by': 'order by' in query_str,
-            'has_group_by': 'group by' in query_str,
-            'has_having': 'having' in query_str
+            'join_count': f.join_count,
+            'subquery_count': f.select_count - 1,
+            'where_conditions': f.and_or_count + 1,
+            'has_order_by': f.has_order_by,
+            'has_group_by': f.has_group_by,
+            'has_having': f.has_having
         }
     
     def _suggest_specific_columns(self, query: str) -> str:
         """Suggest replacing SELECT * with specific columns"""
-        # This is a simplified example - in practice, you'd need schema info
-        return query.replace('SELECT *', 'SELECT column1, column2, column3  -- Replace with actual column names')
-    
+        return _suggest_specific_columns(query)
+
     def _load_optimization_rules(self) -> Dict:
         """Load predefined optimization rules"""
         return {
@@ -538,55 +859,101 @@ class SQLOptimizerEngine:
             'detect_n_plus_one': True
         }
 
+class QuerySession:
+    """One query's analysis shared across every downstream product
+
+    Callers that analyze, rewrite and format the same query in tandem can
+    hold a session instead of repeating engine calls: the query is parsed
+    and checked once on first use, and optimized() and report() both read
+    that single result. The plain analyze_query API remains the entry
+    point for one-shot callers (and already memoizes behind the scenes).
+    """
+
+    def __init__(self, engine: SQLOptimizerEngine, query: str):
+        self.engine = engine
+        self.query = query
+        self._analysis = None
+
+    def analyze(self) -> QueryAnalysisResult:
+        """Run (or reuse) the analysis for this session's query"""
+        if self._analysis is None:
+            self._analysis = self.engine.analyze_query(self.query)
+        return self._analysis
+
+    def optimized(self) -> str:
+        """Return the first available rewrite, or the original query"""
+        for suggestion in self.analyze().suggestions:
+            if suggestion.optimized_query:
+                return suggestion.resolve_optimized_query()
+        return self.query
+
+    def report(self) -> str:
+        """Render the markdown report for this session's analysis"""
+        return format_analysis_result(self.analyze())
+
+# Per-process engine for analyze_queries_batch workers, created once by
+# the pool initializer so every task reuses its caches
+_WORKER_ENGINE = None
+
+def _worker_init(schema_info: Dict):
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = SQLOptimizerEngine()
+    if schema_info:
+        _WORKER_ENGINE.install_parsed_schema(schema_info)
+
+def _worker_analyze(query: str) -> QueryAnalysisResult:
+    return _WORKER_ENGINE.analyze_query(query)
+
+_LEVEL_EMOJI = {
+    OptimizationLevel.CRITICAL: "🚨",
+    OptimizationLevel.HIGH: "⚠️",
+    OptimizationLevel.MEDIUM: "⚡",
+    OptimizationLevel.LOW: "💡"
+}
+
 def format_analysis_result(analysis: QueryAnalysisResult) -> str:
-    """Format the analysis result as markdown for display"""
-    result = f"# SQL Query Analysis Report\n\n"
-    result += f"**Performance Score:** {analysis.performance_score}/100\n\n"
-    
+    """Format the analysis result as markdown for display
+
+    Accumulates fragments in a list and joins once at the end; repeated
+    str += would recopy the growing report on every append.
+    """
+    out = ["# SQL Query Analysis Report\n\n"]
+    out.append(f"**Performance Score:** {analysis.performance_score}/100\n\n")
+
     if analysis.suggestions:
-        result += f"## 🔍 Query Analysis\n\n"
-        
+        out.append("## 🔍 Query Analysis\n\n")
+
         # Group suggestions by category
-        categories = {}
+        categories = defaultdict(list)
         for suggestion in analysis.suggestions:
-            if suggestion.category not in categories:
-                categories[suggestion.category] = []
             categories[suggestion.category].append(suggestion)
-        
+
         for category, suggestions in categories.items():
-            result += f"### {category}\n\n"
-            
+            out.append(f"### {category}\n\n")
+
             for suggestion in suggestions:
-                # Level emoji
-                level_emoji = {
-                    OptimizationLevel.CRITICAL: "🚨",
-                    OptimizationLevel.HIGH: "⚠️",
-                    OptimizationLevel.MEDIUM: "⚡",
-                    OptimizationLevel.LOW: "💡"
-                }
-                
-                result += f"{level_emoji.get(suggestion.level, '📝')} **{suggestion.level.value.title()} Priority**\n\n"
-                result += f"**Issue:** {suggestion.issue}\n\n"
-                result += f"**Recommendation:** {suggestion.suggestion}\n\n"
-                
+                out.append(f"{_LEVEL_EMOJI.get(suggestion.level, '📝')} **{suggestion.level.value.title()} Priority**\n\n")
+                out.append(f"**Issue:** {suggestion.issue}\n\n")
+                out.append(f"**Recommendation:** {suggestion.suggestion}\n\n")
+
                 if suggestion.optimized_query:
-                    result += f"**Optimized Query:**\n```sql\n{suggestion.optimized_query}\n```\n\n"
-                
+                    out.append(f"**Optimized Query:**\n```sql\n{suggestion.resolve_optimized_query()}\n```\n\n")
+
                 if suggestion.index_recommendation:
-                    result += f"**Index Recommendations:**\n```sql\n{suggestion.index_recommendation}\n```\n\n"
-                
-                result += "---\n\n"
+                    out.append(f"**Index Recommendations:**\n```sql\n{suggestion.index_recommendation}\n```\n\n")
+
+                out.append("---\n\n")
     else:
-        result += "## ✅ Great Job!\n\nYour query looks well-optimized. No major issues detected.\n\n"
-    
+        out.append("## ✅ Great Job!\n\nYour query looks well-optimized. No major issues detected.\n\n")
+
     # Complexity analysis
     complexity = analysis.complexity_analysis
-    result += f"## 📊 Complexity Analysis\n\n"
-    result += f"- **Joins:** {complexity.get('join_count', 0)}\n"
-    result += f"- **Subqueries:** {complexity.get('subquery_count', 0)}\n"
-    result += f"- **WHERE Conditions:** {complexity.get('where_conditions', 0)}\n"
-    result += f"- **Has ORDER BY:** {'Yes' if complexity.get('has_order_by') else 'No'}\n"
-    result += f"- **Has GROUP BY:** {'Yes' if complexity.get('has_group_by') else 'No'}\n"
-    result += f"- **Has HAVING:** {'Yes' if complexity.get('has_having') else 'No'}\n\n"
-    
-    return result
\ No newline at end of file
+    out.append("## 📊 Complexity Analysis\n\n")
+    out.append(f"- **Joins:** {complexity.get('join_count', 0)}\n")
+    out.append(f"- **Subqueries:** {complexity.get('subquery_count', 0)}\n")
+    out.append(f"- **WHERE Conditions:** {complexity.get('where_conditions', 0)}\n")
+    out.append(f"- **Has ORDER BY:** {'Yes' if complexity.get('has_order_by') else 'No'}\n")
+    out.append(f"- **Has GROUP BY:** {'Yes' if complexity.get('has_group_by') else 'No'}\n")
+    out.append(f"- **Has HAVING:** {'Yes' if complexity.get('has_having') else 'No'}\n\n")
+
+    return ''.join(out)
\ No newline at end of file
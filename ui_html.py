@@ -0,0 +1,553 @@
+"""
+Static HTML and CSS blocks for the Streamlit app
+
+Kept in their own module so the multi-KB strings are built once at import
+time and every rerun of app.py only passes references to st.markdown.
+Blocks that interpolate values are stored as str.format templates.
+"""
+
+from typing import Final
+
+# Static layout blocks, concatenated once at import time and emitted through a
+# single st.markdown call so reruns pay one markdown round-trip instead of ten
+DEV_WARNING_HTML: Final[str] = """
+<div class="dev-warning">
+    <div class="dev-warning-icon">⚠️</div>
+    <div class="dev-warning-text">
+        <strong>Development Notice:</strong> This app is still under development. 
+        Some features may be experimental or subject to change.
+    </div>
+</div>
+"""
+
+HEADER_HTML: Final[str] = """
+<div class="custom-header">
+    <div style="display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap;">
+        <div>
+            <h1 style="margin-bottom: 0.5rem;">🚀 SQL Assistant Pro</h1>
+            <p style="margin: 0; opacity: 0.9;">Hybrid AI + Rule-Based SQL Assistant Platform</p>
+            <div style="margin-top: 0.5rem; display: flex; align-items: center; justify-content: flex-start; flex-wrap: wrap; gap: 0.5rem;">
+                <span style="background: rgba(255,255,255,0.2); padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.85rem; display: flex; align-items: center;">
+                    👨‍💻 Sudhanshu Sinha
+                    <a href="https://www.linkedin.com/in/sudhanshu-sinha-4619a429a/" target="_blank" style="margin-left: 0.5rem; text-decoration: none; display: flex; align-items: center;">
+                        <svg width="16" height="16" viewBox="0 0 24 24" fill="#0077B5" style="filter: drop-shadow(0 1px 2px rgba(0,0,0,0.3));">
+                            <path d="M20.447 20.452h-3.554v-5.569c0-1.328-.027-3.037-1.852-3.037-1.853 0-2.136 1.445-2.136 2.939v5.667H9.351V9h3.414v1.561h.046c.477-.9 1.637-1.85 3.37-1.85 3.601 0 4.267 2.37 4.267 5.455v6.286zM5.337 7.433a2.062 2.062 0 01-2.063-2.065 2.064 2.064 0 112.063 2.065zm1.782 13.019H3.555V9h3.564v11.452zM22.225 0H1.771C.792 0 0 .774 0 1.729v20.542C0 23.227.792 24 1.771 24h20.451C23.2 24 24 23.227 24 22.271V1.729C24 .774 23.2 0 22.222 0h.003z"/>
+                        </svg>
+                    </a>
+                </span>
+                <span style="background: rgba(255,255,255,0.2); padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.85rem;">✨ v2.0</span>
+                <span style="background: rgba(102, 234, 146, 0.3); padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.85rem;">✓ Online</span>
+                <a href="https://github.com/sriiverse" target="_blank" style="margin-left: 0.3rem; text-decoration: none; display: flex; align-items: center; background: rgba(255,255,255,0.2); padding: 0.3rem 0.8rem; border-radius: 15px; transition: all 0.3s ease;" onmouseover="this.style.background='rgba(255,255,255,0.3)'" onmouseout="this.style.background='rgba(255,255,255,0.2)'">
+                    <svg width="16" height="16" viewBox="0 0 24 24" fill="#ffffff" class="github-icon" style="filter: drop-shadow(0 1px 2px rgba(0,0,0,0.3));">
+                        <path d="M12 0.297c-6.63 0-12 5.373-12 12 0 5.303 3.438 9.8 8.205 11.385.6.113.82-.258.82-.577 0-.285-.01-1.04-.015-2.04-3.338.724-4.042-1.61-4.042-1.61C4.422 18.07 3.633 17.7 3.633 17.7c-1.087-.744.084-.729.084-.729 1.205.084 1.838 1.236 1.838 1.236 1.07 1.835 2.809 1.305 3.495.998.108-.776.417-1.305.76-1.605-2.665-.3-5.466-1.332-5.466-5.93 0-1.31.465-2.38 1.235-3.22-.135-.303-.54-1.523.105-3.176 0 0 1.005-.322 3.3 1.23.96-.267 1.98-.399 3-.405 1.02.006 2.04.138 3 .405 2.28-1.552 3.285-1.23 3.285-1.23.645 1.653.24 2.873.12 3.176.765.84 1.23 1.91 1.23 3.22 0 4.61-2.805 5.625-5.475 5.92.42.36.81 1.096.81 2.22 0 1.606-.015 2.896-.015 3.286 0 .315.21.69.825.57C20.565 22.092 24 17.592 24 12.297c0-6.627-5.373-12-12-12"/>
+                    </svg>
+                    <span style="margin-left: 0.4rem; color: #ffffff; font-size: 0.85rem;">GitHub</span>
+                </a>
+            </div>
+        </div>
+        <div style="text-align: right; min-width: 200px;">
+            <div style="background: rgba(255,255,255,0.1); padding: 1rem; border-radius: 10px; backdrop-filter: blur(5px);">
+                <div style="font-size: 0.9rem; opacity: 0.8; margin-bottom: 0.5rem;">Performance Metrics</div>
+                <div style="display: flex; gap: 1rem; justify-content: center;">
+                    <div style="text-align: center;">
+                        <div style="font-size: 1.2rem; font-weight: bold; color: #4facfe;">&lt;1s</div>
+                        <div style="font-size: 0.7rem; opacity: 0.8;">Analysis Time</div>
+                    </div>
+                    <div style="text-align: center;">
+                        <div style="font-size: 1.2rem; font-weight: bold; color: #f093fb;">17+</div>
+                        <div style="font-size: 0.7rem; opacity: 0.8;">Checks</div>
+                    </div>
+                    <div style="text-align: center;">
+                        <div style="font-size: 1.2rem; font-weight: bold; color: #a8edea;">100%</div>
+                        <div style="font-size: 0.7rem; opacity: 0.8;">Private</div>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+DASHBOARD_HTML: Final[str] = """
+<div class="professional-dashboard">
+    <div class="dashboard-header">
+        <h3 style="color: #ffffff; margin-bottom: 1rem; display: flex; align-items: center;">
+            <span style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 0.5rem; border-radius: 8px; margin-right: 0.8rem;">📊</span>
+            System Analytics & Capabilities
+        </h3>
+    </div>
+    <div class="stats-grid">
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">⚡</span>
+                <span class="stat-category">Performance</span>
+            </div>
+            <div class="stat-value">0.8s</div>
+            <div class="stat-label">Avg Analysis Time</div>
+            <div class="stat-trend positive">↑ 15% faster</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">🔍</span>
+                <span class="stat-category">Analysis</span>
+            </div>
+            <div class="stat-value">17</div>
+            <div class="stat-label">Optimization Rules</div>
+            <div class="stat-trend positive">✓ 7 new checks</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">🧠</span>
+                <span class="stat-category">AI + Rules</span>
+            </div>
+            <div class="stat-value">Hybrid</div>
+            <div class="stat-label">Generation Engine</div>
+            <div class="stat-trend positive">✓ Gemini + Patterns</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">🔒</span>
+                <span class="stat-category">Security</span>
+            </div>
+            <div class="stat-value">Smart</div>
+            <div class="stat-label">Validation Layer</div>
+            <div class="stat-trend positive">✓ AI + Rules</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">💰</span>
+                <span class="stat-category">Cost</span>
+            </div>
+            <div class="stat-value">$0*</div>
+            <div class="stat-label">Base Usage</div>
+            <div class="stat-trend positive">✓ Fallback ready</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">🌍</span>
+                <span class="stat-category">Availability</span>
+            </div>
+            <div class="stat-value">99.9%</div>
+            <div class="stat-label">Uptime</div>
+            <div class="stat-trend positive">✓ Global CDN</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">🎯</span>
+                <span class="stat-category">Accuracy</span>
+            </div>
+            <div class="stat-value">100%</div>
+            <div class="stat-label">Query Generation</div>
+            <div class="stat-trend positive">✓ 12/12 tests passed</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">🔗</span>
+                <span class="stat-category">Schema</span>
+            </div>
+            <div class="stat-value">Smart</div>
+            <div class="stat-label">Table Recognition</div>
+            <div class="stat-trend positive">✓ Auto-detection</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-header">
+                <span class="stat-icon">⚙️</span>
+                <span class="stat-category">Patterns</span>
+            </div>
+            <div class="stat-value">12+</div>
+            <div class="stat-label">Business Logic</div>
+            <div class="stat-trend positive">✓ Enterprise ready</div>
+        </div>
+    </div>
+</div>
+"""
+
+WORKFLOW_HTML: Final[str] = """
+<br>
+<div style="background: rgba(15, 25, 35, 0.8); padding: 2rem; border-radius: 15px; border: 1px solid rgba(255,255,255,0.1); margin: 2rem 0;">
+    <div style="text-align: center; margin-bottom: 2rem;">
+        <h3 style="color: #ffffff; margin-bottom: 1rem;">
+            🎯 Development Workflow
+        </h3>
+        <p style="color: #8892b0;">Choose your development task to begin the analysis pipeline</p>
+    </div>
+</div>
+"""
+
+MODE_CARDS_HTML: Final[str] = """
+<div class="mode-cards-container" style="display: grid; grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); gap: 1rem;">
+<div style="background: rgba(25, 35, 50, 0.8); padding: 2rem; border-radius: 12px; border: 2px solid rgba(255,255,255,0.1); text-align: center; height: 300px;">
+    <div style="font-size: 3rem; margin-bottom: 1rem;">🔧</div>
+    <h4 style="color: #ffffff; margin-bottom: 1rem;">Query Optimization</h4>
+    <p style="color: #8892b0; margin-bottom: 1.5rem; font-size: 0.9rem;">Analyze existing SQL queries for performance bottlenecks and optimization opportunities</p>
+    <div style="display: flex; flex-wrap: wrap; gap: 0.5rem; justify-content: center;">
+        <span style="background: rgba(102, 126, 234, 0.2); color: #667eea; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.8rem;">Performance Analysis</span>
+        <span style="background: rgba(102, 126, 234, 0.2); color: #667eea; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.8rem;">Index Suggestions</span>
+        <span style="background: rgba(102, 126, 234, 0.2); color: #667eea; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.8rem;">Best Practices</span>
+    </div>
+</div>
+<div style="background: rgba(25, 35, 50, 0.8); padding: 2rem; border-radius: 12px; border: 2px solid rgba(255,255,255,0.1); text-align: center; height: 300px;">
+    <div style="font-size: 3rem; margin-bottom: 1rem;">✨</div>
+    <h4 style="color: #ffffff; margin-bottom: 1rem;">Query Generation</h4>
+    <p style="color: #8892b0; margin-bottom: 1.5rem; font-size: 0.9rem;">Convert natural language into optimized SQL queries using intelligent pattern matching</p>
+    <div style="display: flex; flex-wrap: wrap; gap: 0.5rem; justify-content: center;">
+        <span style="background: rgba(79, 172, 254, 0.2); color: #4facfe; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.8rem;">NLP Processing</span>
+        <span style="background: rgba(79, 172, 254, 0.2); color: #4facfe; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.8rem;">Schema Awareness</span>
+        <span style="background: rgba(79, 172, 254, 0.2); color: #4facfe; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.8rem;">Smart Templates</span>
+    </div>
+</div>
+</div>
+"""
+
+MOBILE_SPACING_HTML: Final[str] = """
+<div style="margin: 2rem 0;">
+    <!-- Mobile responsive spacing -->
+</div>
+
+<!-- Additional spacing for mobile portrait mode -->
+"""
+
+STEP1_HTML: Final[str] = """
+<div class="card">
+    <div class="step-indicator">🎯 Step 1: Select Your Operation</div>
+    <p style="color: #ffffff; margin-bottom: 1rem;">Choose your development workflow to begin the analysis pipeline</p>
+</div>
+"""
+
+STATIC_LAYOUT_HTML: Final[str] = (
+    DEV_WARNING_HTML
+    + HEADER_HTML
+    + DASHBOARD_HTML
+    + WORKFLOW_HTML
+    + MODE_CARDS_HTML
+    + MOBILE_SPACING_HTML
+    + STEP1_HTML
+)
+
+# Static blocks used inside the workflow fragment, built once at import
+STEP2_SCHEMA_HTML: Final[str] = """
+<div class="card">
+    <div class="step-indicator">📋 Step 2: Provide Database Schema</div>
+    <p style="color: #ffffff; margin-bottom: 1rem;">Paste your database schema below to get context-aware suggestions</p>
+</div>
+
+"""
+
+SCHEMA_TIPS_HTML: Final[str] = """
+<div class="metric-card">
+    <h4 style="color: #667eea; margin-bottom: 0.5rem;">📊 Schema Info</h4>
+    <p style="font-size: 0.9rem; color: #ffffff; margin-bottom: 0;">Detected tables and relationships will appear here after analysis</p>
+</div>
+
+<div class="metric-card" style="margin-top: 1rem;">
+    <h4 style="color: #667eea; margin-bottom: 0.5rem;">📝 Tips</h4>
+    <ul style="font-size: 0.85rem; color: #ffffff; text-align: left; padding-left: 1rem;">
+        <li>Include all relevant tables</li>
+        <li>Include primary/foreign keys</li>
+        <li>Add column data types</li>
+    </ul>
+</div>
+
+"""
+
+OPTIMIZE_LAB_HEADER_HTML: Final[str] = """
+<div style="background: rgba(15, 25, 35, 0.8); padding: 2rem; border-radius: 15px; border: 1px solid rgba(255,255,255,0.1); margin: 2rem 0; text-align: center;">
+    <h3 style="color: #ffffff; margin-bottom: 0.5rem;">
+        🔧 Query Optimization Lab
+    </h3>
+    <p style="color: #8892b0; margin-bottom: 0;">Advanced SQL performance analysis and optimization engine</p>
+</div>
+
+"""
+
+QUERY_EDITOR_HEADER_HTML: Final[str] = """
+<div style="background: rgba(25, 35, 50, 0.8); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255,255,255,0.1); margin: 1rem 0;">
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
+        <div style="display: flex; align-items: center; color: #ffffff; font-size: 1.1rem; font-weight: 600;">
+            <span style="background: #667eea; color: white; padding: 0.3rem 0.7rem; border-radius: 50%; font-size: 0.9rem; font-weight: bold; margin-right: 0.8rem; width: 2rem; height: 2rem; display: inline-flex; align-items: center; justify-content: center;">03</span>
+            SQL Query Editor
+        </div>
+        <div style="display: flex; gap: 1rem;">
+            <span style="background: rgba(102, 126, 234, 0.2); color: #667eea; padding: 0.5rem 1rem; border-radius: 8px; font-size: 0.9rem; border: 1px solid rgba(102, 126, 234, 0.3);">📋 Format</span>
+            <span style="background: rgba(102, 126, 234, 0.2); color: #667eea; padding: 0.5rem 1rem; border-radius: 8px; font-size: 0.9rem; border: 1px solid rgba(102, 126, 234, 0.3);">✓ Validate</span>
+            <span style="background: rgba(102, 126, 234, 0.2); color: #667eea; padding: 0.5rem 1rem; border-radius: 8px; font-size: 0.9rem; border: 1px solid rgba(102, 126, 234, 0.3);">🗑️ Clear</span>
+        </div>
+    </div>
+</div>
+
+"""
+
+GENERATE_LAB_HEADER_HTML: Final[str] = """
+<div style="background: rgba(15, 25, 35, 0.8); padding: 2rem; border-radius: 15px; border: 1px solid rgba(255,255,255,0.1); margin: 2rem 0; text-align: center;">
+    <h3 style="color: #ffffff; margin-bottom: 0.5rem;">
+        ✨ AI Query Generation Lab
+    </h3>
+    <p style="color: #8892b0; margin-bottom: 0;">Transform natural language into optimized SQL queries using intelligent pattern matching</p>
+</div>
+
+"""
+
+NLP_HEADER_HTML: Final[str] = """
+<div style="background: rgba(25, 35, 50, 0.8); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255,255,255,0.1); margin: 1rem 0;">
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
+        <div style="display: flex; align-items: center; color: #ffffff; font-size: 1.1rem; font-weight: 600;">
+            <span style="background: #4facfe; color: white; padding: 0.3rem 0.7rem; border-radius: 50%; font-size: 0.9rem; font-weight: bold; margin-right: 0.8rem; width: 2rem; height: 2rem; display: inline-flex; align-items: center; justify-content: center;">03</span>
+            Natural Language Processor
+        </div>
+        <div style="display: flex; gap: 1rem;">
+            <span style="background: rgba(79, 172, 254, 0.2); color: #4facfe; padding: 0.5rem 1rem; border-radius: 8px; font-size: 0.9rem; border: 1px solid rgba(79, 172, 254, 0.3);">💡 Suggest</span>
+            <span style="background: rgba(79, 172, 254, 0.2); color: #4facfe; padding: 0.5rem 1rem; border-radius: 8px; font-size: 0.9rem; border: 1px solid rgba(79, 172, 254, 0.3);">📚 Examples</span>
+            <span style="background: rgba(79, 172, 254, 0.2); color: #4facfe; padding: 0.5rem 1rem; border-radius: 8px; font-size: 0.9rem; border: 1px solid rgba(79, 172, 254, 0.3);">🗑️ Clear</span>
+        </div>
+    </div>
+</div>
+
+"""
+
+READY_TO_EXECUTE_HTML: Final[str] = """
+<div style="background: rgba(15, 25, 35, 0.8); padding: 2rem; border-radius: 15px; border: 1px solid rgba(255,255,255,0.1); margin: 2rem 0; text-align: center;">
+    <h3 style="color: #ffffff; margin-bottom: 1rem;">
+        🚀 Ready to Execute
+    </h3>
+    <p style="color: #8892b0; margin-bottom: 0;">Your analysis pipeline is configured and ready to process</p>
+</div>
+
+"""
+
+PIPELINE_LOADING_HTML: Final[str] = """
+<div style="text-align: center; margin: 2rem 0;">
+    <h3 style="color: #667eea;">🚀 Processing Pipeline Active</h3>
+    <p style="color: #ffffff;">Advanced SQL analysis engines are processing your request...</p>
+</div>
+<div style="display: grid; grid-template-columns: repeat(4, 1fr); text-align: center;">
+    <div>🔍<br><strong>Schema Analysis</strong></div>
+    <div>⚙️<br><strong>Query Processing</strong></div>
+    <div>🎯<br><strong>Optimization</strong></div>
+    <div>✅<br><strong>Results</strong></div>
+</div>
+"""
+
+# Blocks rendered on the results / error paths
+VALIDATION_ERROR_HTML: Final[str] = """
+<div class="error-container">
+    <div class="error-header">
+        <h3 style="color: #ff6b6b; margin-bottom: 0.8rem; display: flex; align-items: center;">
+            <span style="background: rgba(255, 107, 107, 0.2); padding: 0.5rem; border-radius: 8px; margin-right: 0.8rem;">⚠️</span>
+            Validation Error
+        </h3>
+        <p style="color: #ffffff; margin-bottom: 1.5rem;">Required information is missing to proceed with analysis</p>
+    </div>
+
+    <div class="error-details">
+        <div class="error-item">
+            <span class="error-icon">📝</span>
+            <span class="error-text">Database schema is required for context-aware analysis</span>
+        </div>
+        <div class="error-item">
+            <span class="error-icon">💬</span>
+            <span class="error-text">Query description or SQL code is needed for processing</span>
+        </div>
+    </div>
+
+    <div class="error-action">
+        <p style="color: #8892b0; font-size: 0.9rem; margin: 0;">Please complete both sections above and try again.</p>
+    </div>
+</div>
+"""
+
+RESULTS_HEADER_HTML: Final[str] = """
+<div style="background: rgba(15, 25, 35, 0.8); padding: 2rem; border-radius: 15px; border: 1px solid rgba(255,255,255,0.1); margin: 2rem 0; text-align: center;">
+    <h3 style="color: #ffffff; margin-bottom: 1rem;">
+        🎆 Analysis Results
+    </h3>
+    <p style="color: #8892b0; margin-bottom: 0;">Comprehensive analysis and optimization recommendations</p>
+</div>
+
+"""
+
+OPT_REPORT_HEADER_HTML: Final[str] = """
+<div style="background: rgba(25, 35, 50, 0.8); padding: 2rem; border-radius: 12px; margin: 1rem 0;">
+    <h4 style="color: #667eea; margin-bottom: 1.5rem; text-align: center;">
+        🔧 Optimization Analysis Report
+    </h4>
+</div>
+
+"""
+
+SUGGESTIONS_HEADER_HTML: Final[str] = """
+<div style="background: rgba(25, 35, 50, 0.8); padding: 2rem; border-radius: 12px; margin: 2rem 0;">
+    <h4 style="color: #f093fb; margin-bottom: 1.5rem; text-align: center;">
+        💡 Optimization Suggestions
+    </h4>
+</div>
+
+"""
+
+FOOTER_HTML: Final[str] = """
+<div class="custom-footer">
+    <h3 style="margin-bottom: 1rem;">🚀 Hybrid SQL Assistant</h3>
+    <div style="display: flex; justify-content: center; gap: 2rem; margin-bottom: 1rem; flex-wrap: wrap;">
+        <div style="text-align: center;">
+            <h4 style="color: #4facfe; margin-bottom: 0.5rem;">⚡ Performance</h4>
+            <p style="font-size: 0.9rem; opacity: 0.9;">Instant Analysis</p>
+        </div>
+        <div style="text-align: center;">
+            <h4 style="color: #f093fb; margin-bottom: 0.5rem;">🔒 Privacy</h4>
+            <p style="font-size: 0.9rem; opacity: 0.9;">100% Local</p>
+        </div>
+        <div style="text-align: center;">
+            <h4 style="color: #a8edea; margin-bottom: 0.5rem;">🌍 Zero Cost</h4>
+            <p style="font-size: 0.9rem; opacity: 0.9;">No API Limits</p>
+        </div>
+        <div style="text-align: center;">
+            <h4 style="color: #fed6e3; margin-bottom: 0.5rem;">🧠 Hybrid</h4>
+            <p style="font-size: 0.9rem; opacity: 0.9;">AI + Rules</p>
+        </div>
+    </div>
+    <hr style="border: none; height: 1px; background: rgba(255,255,255,0.2); margin: 1.5rem 0;">
+    <p style="margin-bottom: 0.5rem;">Made with ❤️ using <strong>Streamlit</strong> and <strong>Hybrid AI + Rule-Based Engine</strong></p>
+    <p style="font-size: 0.9rem; opacity: 0.8; margin-bottom: 1rem; display: flex; align-items: center; justify-content: center; gap: 0.5rem;">
+        Developed by <strong>Sudhanshu Sinha</strong> | Intelligent fallbacks included!
+    </p>
+    <div style="margin: 1rem 0; display: flex; align-items: center; justify-content: center; gap: 1rem;">
+        <span style="font-size: 0.9rem; color: #ffffff;">Contact me:</span>
+        <a href="mailto:sudhanshutheking183@gmail.com" style="text-decoration: none; display: flex; align-items: center; background: rgba(255,255,255,0.2); padding: 0.5rem 1rem; border-radius: 20px; transition: all 0.3s ease;" onmouseover="this.style.background='rgba(255,255,255,0.3)'" onmouseout="this.style.background='rgba(255,255,255,0.2)'">
+            <svg width="20" height="20" viewBox="0 0 24 24" fill="#EA4335" style="margin-right: 0.5rem;">
+                <path d="M24 5.457v13.909c0 .904-.732 1.636-1.636 1.636h-3.819V11.73L12 16.64l-6.545-4.91v9.273H1.636A1.636 1.636 0 0 1 0 19.366V5.457c0-.9.732-1.636 1.636-1.636h.004L12 12.01l10.36-8.189h.004A1.636 1.636 0 0 1 24 5.457z"/>
+            </svg>
+            <span style="color: #ffffff; font-size: 0.9rem;">Gmail</span>
+        </a>
+    </div>
+    <div style="margin-top: 1rem;">
+        <p style="font-size: 0.8rem; opacity: 0.7;">🎆 Professional SQL optimization and query generation tool for developers</p>
+    </div>
+</div>
+
+<!-- Additional spacing -->
+<div style="height: 2rem;"></div>
+"""
+
+GEN_RESULT_HEADER_TMPL: Final[str] = """
+<div style="background: rgba(25, 35, 50, 0.8); padding: 2rem; border-radius: 12px; margin: 1rem 0;">
+    <h4 style="color: {header_color}; margin-bottom: 1.5rem; text-align: center;">
+        {header_title}
+    </h4>
+</div>
+"""
+
+PROCESSING_ERROR_TMPL: Final[str] = """
+<div class="critical-error">
+    <div class="error-header">
+        <h3 style="color: #ff6b6b; margin-bottom: 1rem; display: flex; align-items: center; justify-content: center;">
+            <span style="background: rgba(255, 107, 107, 0.2); padding: 0.5rem; border-radius: 8px; margin-right: 0.8rem;">🚫</span>
+            Processing Error
+        </h3>
+        <p style="color: #ffffff; text-align: center; margin-bottom: 2rem;">An unexpected error occurred during analysis</p>
+    </div>
+
+    <div class="error-details">
+        <div class="error-message">
+            <h5 style="color: #ff6b6b; margin-bottom: 0.8rem;">📜 Error Details:</h5>
+            <code style="background: rgba(255,255,255,0.1); padding: 1rem; border-radius: 6px; display: block; color: #ffffff;">{e}</code>
+        </div>
+    
+        <div class="error-actions">
+            <h5 style="color: #4facfe; margin-bottom: 1rem;">🔧 Troubleshooting Steps:</h5>
+            <ul style="color: #ffffff; line-height: 1.6;">
+                <li>Verify your database schema is valid SQL</li>
+                <li>Check that your query description is clear and specific</li>
+                <li>Ensure all table and column names are properly referenced</li>
+                <li>Try simplifying your request and run again</li>
+            </ul>
+        </div>
+    </div>
+</div>
+"""
+
+# Page-level CSS gathered from the individual blocks above and injected
+# through one <style> tag alongside the main stylesheet
+MOBILE_RADIO_CSS: Final[str] = """
+@media (max-width: 768px) {
+    .stRadio {
+        margin-top: 2rem !important;
+    }
+}
+"""
+
+ERROR_VALIDATION_CSS: Final[str] = """
+.error-container {
+    background: rgba(25, 15, 15, 0.8);
+    padding: 2rem;
+    border-radius: 15px;
+    border: 1px solid rgba(255, 107, 107, 0.3);
+    backdrop-filter: blur(10px);
+    margin: 2rem 0;
+}
+
+.error-header {
+    text-align: center;
+    margin-bottom: 2rem;
+}
+
+.error-details {
+    background: rgba(255,255,255,0.05);
+    padding: 1.5rem;
+    border-radius: 10px;
+    margin-bottom: 1.5rem;
+}
+
+.error-item {
+    display: flex;
+    align-items: center;
+    margin-bottom: 1rem;
+    padding: 0.8rem;
+    background: rgba(255, 107, 107, 0.1);
+    border-radius: 8px;
+    border-left: 3px solid #ff6b6b;
+}
+
+.error-item:last-child {
+    margin-bottom: 0;
+}
+
+.error-icon {
+    margin-right: 1rem;
+    font-size: 1.2rem;
+}
+
+.error-text {
+    color: #ffffff;
+    font-size: 0.95rem;
+    font-weight: 500;
+}
+
+.error-action {
+    text-align: center;
+    padding: 1rem;
+    background: rgba(255,255,255,0.05);
+    border-radius: 8px;
+}
+"""
+
+CRITICAL_ERROR_CSS: Final[str] = """
+.critical-error {
+    background: rgba(25, 15, 15, 0.8);
+    padding: 2rem;
+    border-radius: 15px;
+    border: 1px solid rgba(255, 107, 107, 0.3);
+    backdrop-filter: blur(10px);
+    margin: 2rem 0;
+}
+
+.error-details {
+    background: rgba(255,255,255,0.05);
+    padding: 1.5rem;
+    border-radius: 10px;
+}
+
+.error-message {
+    margin-bottom: 2rem;
+}
+"""
+
+GLOBAL_CSS: Final[str] = MOBILE_RADIO_CSS + ERROR_VALIDATION_CSS + CRITICAL_ERROR_CSS
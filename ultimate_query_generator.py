@@ -5,311 +5,422 @@ Extreme optimization for absolute precision in business query generation
 """
 
 import re
-from typing import Dict, List, Optional, Tuple, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Fallback-extraction patterns, compiled once at import instead of being
+# re-parsed by re.search on every generated query
+_LIMIT_RE = re.compile(r'top\s+(\d+)|first\s+(\d+)|show\s+(\d+)')
+_AMOUNT_RE = re.compile(r'\$(\d+)|(?:more than|over|above|greater than)\s+(\d+)')
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+_SPENDING_RE = re.compile(
+    r'spent.*?over.*?\$?(\d+)|spent.*?more than.*?\$?(\d+)|spent.*?\$(\d+)')
+# Canonical casings for the vocabulary the extractors see most, so hot
+# values reuse one interned string instead of re-casing a copy per call
+_TITLE_CANON = {
+    'new york': 'New York',
+    'california': 'California',
+    'electronics': 'Electronics',
+    'clothing': 'Clothing',
+    'books': 'Books',
+}
+_UNIT_UPPER = {'day': 'DAY', 'week': 'WEEK', 'month': 'MONTH', 'year': 'YEAR'}
+
+
+def _title_value(value: str) -> str:
+    value = value.strip()
+    return _TITLE_CANON.get(value) or value.title()
+
+
+def _upper_unit(value: str) -> str:
+    return _UNIT_UPPER.get(value) or value.upper()
+
+
+# Intent words for the schema-aware fallback, matched against a word set
+_FETCH_WORDS = frozenset({'find', 'show', 'get', 'list'})
+
+# Topic cue -> fallback table, in priority order; set_schema keeps only the
+# pairs whose table the current schema actually declares
+_TOPIC_TABLES = (
+    ('customer', 'customers'),
+    ('user', 'users'),
+    ('order', 'orders'),
+    ('product', 'products'),
+)
+
+# Everything suggest_query_improvements looks for, found in one scan
+_SUGG_RE = re.compile(r'select \*|\bwhere\b|\blimit\b|\border by\b')
+
+@dataclass(frozen=True, slots=True)
+class _Pattern:
+    """One business pattern: dispatch metadata, extractor and SQL template
+
+    The compiled regex and the flattened template are derived in
+    __post_init__, so the whole table is built exactly once at import.
+    """
+    id: str
+    extract: Callable[[tuple], Dict[str, str]]
+    triggers: Tuple[str, ...]
+    pattern: str
+    template: str
+    regex: Optional[re.Pattern] = None
+
+    def __post_init__(self):
+        # generate_query lowercases the description once up front, so the
+        # patterns match plain lowercase text without IGNORECASE overhead
+        object.__setattr__(self, 'regex', re.compile(self.pattern))
+        # Templates are written multiline for readability; flatten them here
+        # so generated SQL needs no per-call whitespace cleanup
+        object.__setattr__(self, 'template', re.sub(r'\s+', ' ', self.template).strip())
+
+
+# EXTREME precision patterns for 100% accuracy, one frozen table shared by
+# every generator instance; attribute access on the slots dataclass replaces
+# the per-call dict lookups the dispatch and template paths used to do
+_PATTERNS: Tuple[_Pattern, ...] = (
+    # Pattern 1: Top customers by spending with time filter
+    _Pattern(
+        id='top_customers_spending_time',
+        extract=lambda g: {'limit': g[0] or '5', 'time_number': g[1] or '6', 'time_unit': _upper_unit(g[2]) if g[2] else 'MONTH'},
+        triggers=('top', 'most', 'money', 'last'),
+        pattern=r'(?:find|get|show).*?top\s+(\d+)\s+(?:customers?|users?).*?(?:spent|spending).*?most.*?money.*?(?:last\s+(\d+)\s+(month|day|year)s?)',
+        template="""SELECT u.user_id, u.username, u.email, SUM(o.amount) as total_spent 
+                      FROM users u 
+                      JOIN orders o ON u.user_id = o.user_id 
+                      WHERE o.order_date >= DATE_SUB(CURRENT_DATE, INTERVAL {time_number} {time_unit}) 
+                      GROUP BY u.user_id, u.username, u.email 
+                      ORDER BY total_spent DESC 
+                      LIMIT {limit}"""
+    ),
+    
+    # Pattern 2: Users from location with spending threshold  
+    _Pattern(
+        id='users_location_spending',
+        extract=lambda g: {'location': _title_value(g[0]) if g[0] else 'New York', 'amount': g[1] or '1000'},
+        triggers=('user', 'from', 'more than'),
+        pattern=r'(?:show|find).*?users?.*?from\s+([\w\s]+?)(?:\s+who).*?(?:ordered|spent).*?more than.*?\$?(\d+)',
+        template="""SELECT u.*, SUM(o.amount) as total_spent 
+                      FROM users u 
+                      JOIN orders o ON u.user_id = o.user_id 
+                      WHERE u.address LIKE '%{location}%' 
+                      GROUP BY u.user_id 
+                      HAVING total_spent > {amount}"""
+    ),
+    
+    # Pattern 3: Monthly revenue by category with year
+    _Pattern(
+        id='monthly_revenue_category_year',
+        extract=lambda g: {'year': g[0] or '2023'},
+        triggers=('monthly', 'revenue', 'categor'),
+        pattern=r'(?:calculate|show).*?monthly.*?revenue.*?(?:each\s+)?(?:product\s+)?categor(?:y|ies).*?(\d{4})',
+        template="""SELECT p.category, MONTH(o.order_date) as month, SUM(o.amount) as monthly_revenue 
+                      FROM products p 
+                      JOIN orders o ON p.product_id = o.product_id 
+                      WHERE YEAR(o.order_date) = {year} 
+                      GROUP BY p.category, MONTH(o.order_date) 
+                      ORDER BY p.category, month"""
+    ),
+    
+    # Pattern 4: Average order value by customer status
+    _Pattern(
+        id='avg_order_value_status',
+        extract=lambda g: {},
+        triggers=('average', 'order', 'value', 'status'),
+        pattern=r'(?:get|calculate).*?average.*?order.*?value.*?(?:by\s+)?(?:customer\s+)?status',
+        template="""SELECT u.status, AVG(o.amount) as avg_order_value 
+                      FROM users u 
+                      JOIN orders o ON u.user_id = o.user_id 
+                      GROUP BY u.status"""
+    ),
+    
+    # Pattern 5: Users without orders in time period
+    _Pattern(
+        id='users_no_orders_time',
+        extract=lambda g: {'number': g[0] or '30', 'unit': _upper_unit(g[1]) if g[1] else 'DAY'},
+        triggers=('user', 'order', 'last'),
+        pattern=r'(?:find|get).*?users?.*?(?:haven\'t|have not).*?(?:made|placed).*?orders?.*?last\s+(\d+)\s+(day|month|week)s?',
+        template="""SELECT u.* 
+                      FROM users u 
+                      LEFT JOIN orders o ON u.user_id = o.user_id 
+                          AND o.order_date >= DATE_SUB(CURRENT_DATE, INTERVAL {number} {unit}) 
+                      WHERE o.user_id IS NULL"""
+    ),
+    
+    # Pattern 6: Top products by revenue this year
+    _Pattern(
+        id='top_products_revenue_year',
+        extract=lambda g: {'limit': g[0] or '10'},
+        triggers=('top', 'product', 'revenue'),
+        pattern=r'(?:show|find).*?top\s+(\d+)\s+products?.*?(?:by\s+)?revenue.*?(?:this\s+year)?',
+        template="""SELECT p.*, SUM(o.amount * o.quantity) as total_revenue 
+                      FROM products p 
+                      JOIN orders o ON p.product_id = o.product_id 
+                      WHERE YEAR(o.order_date) = 2024 
+                      GROUP BY p.product_id 
+                      ORDER BY total_revenue DESC 
+                      LIMIT {limit}"""
+    ),
+    
+    # Pattern 7: Count orders per user
+    _Pattern(
+        id='count_orders_per_user',
+        extract=lambda g: {},
+        triggers=('order', 'user'),
+        pattern=r'(?:count|show).*?(?:how many\s+)?orders?.*?(?:each\s+)?users?.*?(?:placed|made)',
+        template="""SELECT u.username, COUNT(o.order_id) as order_count 
+                      FROM users u 
+                      LEFT JOIN orders o ON u.user_id = o.user_id 
+                      GROUP BY u.user_id, u.username 
+                      ORDER BY order_count DESC"""
+    ),
+    
+    # Pattern 8: Orders with status and amount filter
+    _Pattern(
+        id='orders_status_amount',
+        extract=lambda g: {'status': g[0] or 'pending', 'amount': g[1] or '100'},
+        triggers=('order', 'status', 'amount'),
+        pattern=r'(?:find|get).*?orders?.*?status\s+(\w+).*?amount.*?(?:greater than|>|more than)\s+(\d+)',
+        template="""SELECT * 
+                      FROM orders 
+                      WHERE status = '{status}' AND amount > {amount}"""
+    ),
+    
+    # Pattern 9: EXTREME PRECISION - Users with order count AND spending thresholds
+    _Pattern(
+        id='users_orders_spending_complex',
+        extract=lambda g: {'order_count': g[0] or '5', 'spending_amount': g[1] or '500'},
+        triggers=('user', 'more than', 'order', 'spent', 'over'),
+        pattern=r'(?:get|find).*?users?.*?(?:placed|made).*?more than\s+(\d+)\s+orders?.*?spent.*?over.*?\$?(\d+)',
+        template="""SELECT u.*, COUNT(o.order_id) as order_count, SUM(o.amount) as total_spent 
+                      FROM users u 
+                      JOIN orders o ON u.user_id = o.user_id 
+                      GROUP BY u.user_id 
+                      HAVING order_count > {order_count} AND total_spent > {spending_amount}"""
+    ),
+    
+    # Pattern 10: Monthly sales trends by category and year
+    _Pattern(
+        id='monthly_sales_category_year',
+        extract=lambda g: {'category': _title_value(g[0]) if g[0] else 'Electronics', 'year': g[1] or '2023'},
+        triggers=('monthly', 'sales', 'trend', 'category'),
+        pattern=r'(?:show|find).*?monthly.*?sales.*?trends?.*?(?:for\s+)?(\w+)\s+category.*?(\d{4})',
+        template="""SELECT MONTH(o.order_date) as month, SUM(o.amount) as monthly_sales 
+                      FROM orders o 
+                      JOIN products p ON o.product_id = p.product_id 
+                      WHERE p.category = '{category}' AND YEAR(o.order_date) = {year} 
+                      GROUP BY MONTH(o.order_date) 
+                      ORDER BY month"""
+    ),
+    
+    # Pattern 11: Most expensive product in each category
+    _Pattern(
+        id='max_price_per_category',
+        extract=lambda g: {},
+        triggers=('most expensive', 'product', 'category'),
+        pattern=r'(?:find|show).*?most expensive.*?product.*?(?:in\s+)?each\s+category',
+        template="""SELECT p1.category, p1.name, p1.price 
+                      FROM products p1 
+                      WHERE p1.price = (
+                          SELECT MAX(p2.price) 
+                          FROM products p2 
+                          WHERE p2.category = p1.category
+                      ) 
+                      ORDER BY p1.category"""
+    ),
+    
+    # Pattern 12: Customers from location who bought category
+    _Pattern(
+        id='customers_location_category',
+        extract=lambda g: {'location': _title_value(g[0]) if g[0] else 'New York', 'category': _title_value(g[1]) if g[1] else 'Electronics'},
+        triggers=('from', 'product'),
+        pattern=r'(?:list|find).*?(?:customers?|users?).*?from\s+([\w\s]+?)(?:\s+who).*?(?:bought|purchased).*?(\w+).*?products?',
+        template="""SELECT DISTINCT u.* 
+                      FROM users u 
+                      JOIN orders o ON u.user_id = o.user_id 
+                      JOIN products p ON o.product_id = p.product_id 
+                      WHERE u.address LIKE '%{location}%' AND p.category = '{category}'"""
+    ),
+)
+
+_PATTERNS_BY_ID: Dict[str, _Pattern] = {p.id: p for p in _PATTERNS}
+
+# One combined alternation answers "does anything match, and what?" in a
+# single scan; the winner's own regex is re-run for captures
+_DISPATCH_RE: re.Pattern = re.compile(
+    '|'.join(f'(?P<{p.id}>{p.pattern})' for p in _PATTERNS))
+
+# With hyperscan present, all twelve patterns are matched in one vectorized
+# pass; the re alternation above stays as the fallback
+if HYPERSCAN_AVAILABLE:
+    _HS_DISPATCH_DB = hyperscan.Database()
+    _HS_DISPATCH_DB.compile(
+        expressions=[p.pattern.encode() for p in _PATTERNS],
+        ids=list(range(len(_PATTERNS)))
+    )
+else:
+    _HS_DISPATCH_DB = None
+
+
+class _SafeDict(dict):
+    """Lookup table for str.format_map that leaves unknown placeholders intact"""
+
+    def __missing__(self, key):
+        return '{' + key + '}'
+
 
 class UltimateSQLGenerator:
     """Ultimate SQL Generator with 100% accuracy guarantee"""
-    
+
+    _QUERY_CACHE_MAX = 256
+
     def __init__(self):
         self.schema_info = {}
-        self.extreme_patterns = self._load_extreme_patterns()
+        self._topic_tables = ()
+        self._default_table = 'users'
+        # Finished SQL memoized per normalized description; repeated
+        # descriptions skip pattern matching and template filling entirely
+        self._query_cache = OrderedDict()
+        self.extreme_patterns = _PATTERNS
     
     def set_schema(self, schema_ddl: str):
         """Parse and store database schema information"""
         self.schema_info = self._parse_schema(schema_ddl)
+        tables = self.schema_info.get('tables', {})
+        self._topic_tables = tuple(
+            pair for pair in _TOPIC_TABLES if pair[1] in tables)
+        self._default_table = next(iter(tables)) if tables else 'users'
+        # Fallback queries depend on the known tables, so cached SQL is stale
+        self._query_cache.clear()
     
     def generate_query(self, description: str) -> str:
         """Generate PERFECT SQL with 100% accuracy"""
-        # EXTREME PATTERN MATCHING - Check every possible business pattern
-        for pattern_info in self.extreme_patterns:
-            match = re.search(pattern_info['pattern'], description, re.IGNORECASE)
-            if match:
-                return self._create_perfect_sql(pattern_info, match, description)
+        # Case and spacing never reach the generated SQL (captured values are
+        # re-cased and templates collapse whitespace), so equivalent phrasings
+        # share one cache slot
+        normalized = ' '.join(description.split()).lower()
+        cached = self._query_cache.get(normalized)
+        if cached is not None:
+            self._query_cache.move_to_end(normalized)
+            return cached
+        result = self._generate_query_uncached(normalized)
+        self._query_cache[normalized] = result
+        if len(self._query_cache) > self._QUERY_CACHE_MAX:
+            self._query_cache.popitem(last=False)
+        return result
+
+    def _generate_query_uncached(self, description: str) -> str:
+        # The caller hands us lowercased, whitespace-collapsed text, so no
+        # matcher below needs its own case folding
+
+        # EXTREME PATTERN MATCHING - Check every possible business pattern.
+        # Each pattern declares literal substrings its regex cannot match
+        # without; only when some pattern's probes all hit does the combined
+        # alternation run, settling the winner in a single scan.
+        if any(all(lit in description for lit in pattern_info.triggers)
+               for pattern_info in self.extreme_patterns):
+            pattern_info = self._dispatch(description)
+            if pattern_info is not None:
+                match = pattern_info.regex.search(description)
+                if match:
+                    return self._create_perfect_sql(pattern_info, match, description)
         
         # Fallback for any unmatched cases
         return self._intelligent_fallback(description)
     
-    def _load_extreme_patterns(self) -> List[Dict]:
-        """Load EXTREME precision patterns for 100% accuracy"""
-        return [
-            # Pattern 1: Top customers by spending with time filter
-            {
-                'id': 'top_customers_spending_time',
-                'pattern': r'(?:find|get|show).*?top\s+(\d+)\s+(?:customers?|users?).*?(?:spent|spending).*?most.*?money.*?(?:last\s+(\d+)\s+(month|day|year)s?)',
-                'template': """SELECT u.user_id, u.username, u.email, SUM(o.amount) as total_spent 
-                              FROM users u 
-                              JOIN orders o ON u.user_id = o.user_id 
-                              WHERE o.order_date >= DATE_SUB(CURRENT_DATE, INTERVAL {time_number} {time_unit}) 
-                              GROUP BY u.user_id, u.username, u.email 
-                              ORDER BY total_spent DESC 
-                              LIMIT {limit}"""
-            },
-            
-            # Pattern 2: Users from location with spending threshold  
-            {
-                'id': 'users_location_spending',
-                'pattern': r'(?:show|find).*?users?.*?from\s+([\w\s]+?)(?:\s+who).*?(?:ordered|spent).*?more than.*?\$?(\d+)',
-                'template': """SELECT u.*, SUM(o.amount) as total_spent 
-                              FROM users u 
-                              JOIN orders o ON u.user_id = o.user_id 
-                              WHERE u.address LIKE '%{location}%' 
-                              GROUP BY u.user_id 
-                              HAVING total_spent > {amount}"""
-            },
-            
-            # Pattern 3: Monthly revenue by category with year
-            {
-                'id': 'monthly_revenue_category_year',
-                'pattern': r'(?:calculate|show).*?monthly.*?revenue.*?(?:each\s+)?(?:product\s+)?categor(?:y|ies).*?(\d{4})',
-                'template': """SELECT p.category, MONTH(o.order_date) as month, SUM(o.amount) as monthly_revenue 
-                              FROM products p 
-                              JOIN orders o ON p.product_id = o.product_id 
-                              WHERE YEAR(o.order_date) = {year} 
-                              GROUP BY p.category, MONTH(o.order_date) 
-                              ORDER BY p.category, month"""
-            },
-            
-            # Pattern 4: Average order value by customer status
-            {
-                'id': 'avg_order_value_status',
-                'pattern': r'(?:get|calculate).*?average.*?order.*?value.*?(?:by\s+)?(?:customer\s+)?status',
-                'template': """SELECT u.status, AVG(o.amount) as avg_order_value 
-                              FROM users u 
-                              JOIN orders o ON u.user_id = o.user_id 
-                              GROUP BY u.status"""
-            },
-            
-            # Pattern 5: Users without orders in time period
-            {
-                'id': 'users_no_orders_time',
-                'pattern': r'(?:find|get).*?users?.*?(?:haven\'t|have not).*?(?:made|placed).*?orders?.*?last\s+(\d+)\s+(day|month|week)s?',
-                'template': """SELECT u.* 
-                              FROM users u 
-                              LEFT JOIN orders o ON u.user_id = o.user_id 
-                                  AND o.order_date >= DATE_SUB(CURRENT_DATE, INTERVAL {number} {unit}) 
-                              WHERE o.user_id IS NULL"""
-            },
-            
-            # Pattern 6: Top products by revenue this year
-            {
-                'id': 'top_products_revenue_year',
-                'pattern': r'(?:show|find).*?top\s+(\d+)\s+products?.*?(?:by\s+)?revenue.*?(?:this\s+year)?',
-                'template': """SELECT p.*, SUM(o.amount * o.quantity) as total_revenue 
-                              FROM products p 
-                              JOIN orders o ON p.product_id = o.product_id 
-                              WHERE YEAR(o.order_date) = 2024 
-                              GROUP BY p.product_id 
-                              ORDER BY total_revenue DESC 
-                              LIMIT {limit}"""
-            },
-            
-            # Pattern 7: Count orders per user
-            {
-                'id': 'count_orders_per_user',
-                'pattern': r'(?:count|show).*?(?:how many\s+)?orders?.*?(?:each\s+)?users?.*?(?:placed|made)',
-                'template': """SELECT u.username, COUNT(o.order_id) as order_count 
-                              FROM users u 
-                              LEFT JOIN orders o ON u.user_id = o.user_id 
-                              GROUP BY u.user_id, u.username 
-                              ORDER BY order_count DESC"""
-            },
-            
-            # Pattern 8: Orders with status and amount filter
-            {
-                'id': 'orders_status_amount',
-                'pattern': r'(?:find|get).*?orders?.*?status\s+(\w+).*?amount.*?(?:greater than|>|more than)\s+(\d+)',
-                'template': """SELECT * 
-                              FROM orders 
-                              WHERE status = '{status}' AND amount > {amount}"""
-            },
-            
-            # Pattern 9: EXTREME PRECISION - Users with order count AND spending thresholds
-            {
-                'id': 'users_orders_spending_complex',
-                'pattern': r'(?:get|find).*?users?.*?(?:placed|made).*?more than\s+(\d+)\s+orders?.*?spent.*?over.*?\$?(\d+)',
-                'template': """SELECT u.*, COUNT(o.order_id) as order_count, SUM(o.amount) as total_spent 
-                              FROM users u 
-                              JOIN orders o ON u.user_id = o.user_id 
-                              GROUP BY u.user_id 
-                              HAVING order_count > {order_count} AND total_spent > {spending_amount}"""
-            },
-            
-            # Pattern 10: Monthly sales trends by category and year
-            {
-                'id': 'monthly_sales_category_year',
-                'pattern': r'(?:show|find).*?monthly.*?sales.*?trends?.*?(?:for\s+)?(\w+)\s+category.*?(\d{4})',
-                'template': """SELECT MONTH(o.order_date) as month, SUM(o.amount) as monthly_sales 
-                              FROM orders o 
-                              JOIN products p ON o.product_id = p.product_id 
-                              WHERE p.category = '{category}' AND YEAR(o.order_date) = {year} 
-                              GROUP BY MONTH(o.order_date) 
-                              ORDER BY month"""
-            },
-            
-            # Pattern 11: Most expensive product in each category
-            {
-                'id': 'max_price_per_category',
-                'pattern': r'(?:find|show).*?most expensive.*?product.*?(?:in\s+)?each\s+category',
-                'template': """SELECT p1.category, p1.name, p1.price 
-                              FROM products p1 
-                              WHERE p1.price = (
-                                  SELECT MAX(p2.price) 
-                                  FROM products p2 
-                                  WHERE p2.category = p1.category
-                              ) 
-                              ORDER BY p1.category"""
-            },
-            
-            # Pattern 12: Customers from location who bought category
-            {
-                'id': 'customers_location_category',
-                'pattern': r'(?:list|find).*?(?:customers?|users?).*?from\s+([\w\s]+?)(?:\s+who).*?(?:bought|purchased).*?(\w+).*?products?',
-                'template': """SELECT DISTINCT u.* 
-                              FROM users u 
-                              JOIN orders o ON u.user_id = o.user_id 
-                              JOIN products p ON o.product_id = p.product_id 
-                              WHERE u.address LIKE '%{location}%' AND p.category = '{category}'"""
-            }
-        ]
     
-    def _create_perfect_sql(self, pattern_info: Dict, match, description: str) -> str:
+    def _dispatch(self, description: str) -> 'Optional[_Pattern]':
+        """Pick the winning business pattern in a single multi-pattern scan
+
+        The hyperscan database reports every matching pattern id at once and
+        the lowest id wins, preserving the declaration-order priority; without
+        hyperscan the combined re alternation settles the winner instead.
+        """
+        if _HS_DISPATCH_DB is not None:
+            ids = set()
+            _HS_DISPATCH_DB.scan(
+                description.encode(),
+                match_event_handler=lambda pid, start, end, flags, ctx: ids.add(pid)
+            )
+            if ids:
+                return _PATTERNS[min(ids)]
+            return None
+        dispatch = _DISPATCH_RE.search(description)
+        if dispatch is None:
+            return None
+        winner = next(name for name, hit in dispatch.groupdict().items()
+                      if hit is not None)
+        return _PATTERNS_BY_ID[winner]
+
+    def _create_perfect_sql(self, pattern_info: '_Pattern', match, description: str) -> str:
         """Create PERFECT SQL with extreme precision"""
-        sql = pattern_info['template'].strip()
-        groups = match.groups()
-        pattern_id = pattern_info['id']
-        
-        # EXTREME PARAMETER EXTRACTION based on pattern ID
-        replacements = {}
-        
-        if pattern_id == 'top_customers_spending_time':
-            # Extract: limit, time_number, time_unit
-            replacements['limit'] = groups[0] if groups[0] else '5'
-            replacements['time_number'] = groups[1] if groups[1] else '6'
-            replacements['time_unit'] = groups[2].upper() if groups[2] else 'MONTH'
-            
-        elif pattern_id == 'users_location_spending':
-            # Extract: location, amount
-            replacements['location'] = groups[0].strip().title() if groups[0] else 'New York'
-            replacements['amount'] = groups[1] if groups[1] else '1000'
-            
-        elif pattern_id == 'monthly_revenue_category_year':
-            # Extract: year
-            replacements['year'] = groups[0] if groups[0] else '2023'
-            
-        elif pattern_id == 'users_no_orders_time':
-            # Extract: number, unit
-            replacements['number'] = groups[0] if groups[0] else '30'
-            replacements['unit'] = groups[1].upper() if groups[1] else 'DAY'
-            
-        elif pattern_id == 'top_products_revenue_year':
-            # Extract: limit
-            replacements['limit'] = groups[0] if groups[0] else '10'
-            
-        elif pattern_id == 'orders_status_amount':
-            # Extract: status, amount
-            replacements['status'] = groups[0].lower() if groups[0] else 'pending'
-            replacements['amount'] = groups[1] if groups[1] else '100'
-            
-        elif pattern_id == 'users_orders_spending_complex':
-            # EXTREME PRECISION - Extract TWO different numbers
-            replacements['order_count'] = groups[0] if groups[0] else '5'
-            replacements['spending_amount'] = groups[1] if groups[1] else '500'
-            
-        elif pattern_id == 'monthly_sales_category_year':
-            # Extract: category, year
-            replacements['category'] = groups[0].title() if groups[0] else 'Electronics'
-            replacements['year'] = groups[1] if groups[1] else '2023'
-            
-        elif pattern_id == 'customers_location_category':
-            # Extract: location, category
-            replacements['location'] = groups[0].strip().title() if groups[0] else 'New York'
-            replacements['category'] = groups[1].title() if groups[1] else 'Electronics'
+        # EXTREME PARAMETER EXTRACTION - each pattern carries its own extractor
+        replacements = pattern_info.extract(match.groups())
         
         # EXTREME FALLBACK EXTRACTION - scan entire description for missing values
         if 'limit' not in replacements:
-            limit_match = re.search(r'top\s+(\d+)|first\s+(\d+)|show\s+(\d+)', description)
+            limit_match = _LIMIT_RE.search(description)
             if limit_match:
                 replacements['limit'] = next(g for g in limit_match.groups() if g)
         
         if 'amount' not in replacements:
-            amount_patterns = [
-                r'\$(\d+)',
-                r'more than\s+(\d+)',
-                r'over\s+(\d+)',
-                r'above\s+(\d+)'
-            ]
-            for pattern in amount_patterns:
-                amount_match = re.search(pattern, description)
-                if amount_match:
-                    replacements['amount'] = amount_match.group(1)
-                    break
+            amount_match = _AMOUNT_RE.search(description)
+            if amount_match:
+                replacements['amount'] = next(g for g in amount_match.groups() if g)
         
         if 'year' not in replacements:
-            year_match = re.search(r'\b(20\d{2})\b', description)
+            year_match = _YEAR_RE.search(description)
             if year_match:
                 replacements['year'] = year_match.group(1)
         
         # EXTREME PRECISION - Handle complex spending queries
         if 'spending_amount' not in replacements and 'spent' in description:
             # Look specifically for spending amounts after "spent"
-            spending_patterns = [
-                r'spent.*?over.*?\$?(\d+)',
-                r'spent.*?more than.*?\$?(\d+)',
-                r'spent.*?\$(\d+)'
-            ]
-            for pattern in spending_patterns:
-                spending_match = re.search(pattern, description)
-                if spending_match:
-                    replacements['spending_amount'] = spending_match.group(1)
-                    break
+            spending_match = _SPENDING_RE.search(description)
+            if spending_match:
+                replacements['spending_amount'] = next(
+                    g for g in spending_match.groups() if g)
         
-        # Apply all replacements
-        for key, value in replacements.items():
-            sql = sql.replace(f'{{{key}}}', str(value))
-        
-        # EXTREME CLEANUP
-        sql = re.sub(r'\s+', ' ', sql).strip()
-        sql = sql.replace('  ', ' ')
-        
-        return sql + ';'
+        # Apply all replacements in one pass; unknown placeholders are kept
+        return pattern_info.template.format_map(_SafeDict(replacements)) + ';'
     
     def _intelligent_fallback(self, description: str) -> str:
-        """Schema-aware intelligent fallback for any edge cases"""
-        desc = description.lower()
-        
-        # Get available table names from schema
-        available_tables = list(self.schema_info.get('tables', {}).keys()) if self.schema_info else []
+        """Schema-aware intelligent fallback for any edge cases
+
+        Receives the already-lowercased description from generate_query.
+        """
+        desc = description
+        words = frozenset(desc.split())
         
-        # Find the most relevant table based on keywords
-        relevant_table = None
-        if 'customer' in desc and 'customers' in available_tables:
-            relevant_table = 'customers'
-        elif 'user' in desc and 'users' in available_tables:
-            relevant_table = 'users'
-        elif 'order' in desc and 'orders' in available_tables:
-            relevant_table = 'orders'
-        elif 'product' in desc and 'products' in available_tables:
-            relevant_table = 'products'
-        elif available_tables:
-            # Default to first available table
-            relevant_table = available_tables[0]
+        # Find the most relevant table based on keywords; the schema-aware
+        # candidates were resolved once in set_schema
+        for topic, table in self._topic_tables:
+            if topic in desc:
+                relevant_table = table
+                break
         else:
-            # Ultimate fallback if no schema
-            relevant_table = 'users'
+            relevant_table = self._default_table
         
         # Generate appropriate query based on intent
-        if any(word in desc for word in ['find', 'show', 'get', 'list']):
+        if words & _FETCH_WORDS:
             # Handle specific filters
             if 'california' in desc or 'from' in desc:
                 return f"SELECT * FROM {relevant_table} WHERE address LIKE '%California%';"
             elif 'price' in desc and 'greater than' in desc:
-                price_match = re.search(r'greater than\s+(\d+)', desc)
-                price = price_match.group(1) if price_match else '100'
+                price_match = _AMOUNT_RE.search(desc)
+                price = next(g for g in price_match.groups() if g) if price_match else '100'
                 return f"SELECT * FROM {relevant_table} WHERE price > {price};"
             else:
                 return f"SELECT * FROM {relevant_table};"
         
-        if any(word in desc for word in ['count', 'how many', 'number of']):
+        if 'count' in words or 'how many' in desc or 'number of' in desc:
             return f"SELECT COUNT(*) as total_{relevant_table} FROM {relevant_table};"
         
         # Default fallback
@@ -317,41 +428,94 @@ class UltimateSQLGenerator:
     
     def _parse_schema(self, schema_ddl: str) -> Dict:
         """Parse database schema"""
-        schema_info = {'tables': {}}
-        
-        table_pattern = r'CREATE TABLE\s+(\w+)\s*\((.*?)\)'
-        for match in re.finditer(table_pattern, schema_ddl, re.DOTALL | re.IGNORECASE):
-            table_name = match.group(1).lower()
-            columns_str = match.group(2)
-            
-            columns = []
-            for line in columns_str.split(','):
-                line = line.strip()
-                if line and not line.startswith('--'):
-                    parts = line.split()
-                    if parts:
-                        columns.append({
-                            'name': parts[0].lower(),
-                            'type': parts[1] if len(parts) > 1 else 'unknown'
-                        })
-            
-            schema_info['tables'][table_name] = {'columns': columns}
-        
-        return schema_info
+        return _parse_schema_cached(schema_ddl)
+
+
+def _split_columns(body: str) -> List[str]:
+    """Split a column-list body on commas at parenthesis depth zero
+
+    A plain split(',') breaks on VARCHAR(50), DECIMAL(10, 2) and CHECK
+    constraints; this scanner tracks nesting so those stay intact.
+    """
+    parts = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(body):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(body[start:i].strip())
+            start = i + 1
+    parts.append(body[start:].strip())
+    return parts
+
+
+@lru_cache(maxsize=32)
+def _parse_schema_cached(schema_ddl: str) -> Dict:
+    """Parse CREATE TABLE DDL, memoized so repeated set_schema calls are O(1)
+
+    Scans for each statement and walks to the matching close paren by depth,
+    so column lists with nested parentheses like DECIMAL(10, 2) no longer
+    truncate at the first ')'.
+    """
+    schema_info = {'tables': {}}
+    lower = schema_ddl.lower()
+    pos = 0
+
+    while True:
+        start = lower.find('create table', pos)
+        if start == -1:
+            break
+        open_paren = schema_ddl.find('(', start)
+        if open_paren == -1:
+            break
+        name_words = schema_ddl[start + 12:open_paren].split()
+        if not name_words:
+            pos = open_paren + 1
+            continue
+        table_name = name_words[-1].lower()
+
+        depth = 1
+        i = open_paren + 1
+        end = len(schema_ddl)
+        while i < end and depth:
+            ch = schema_ddl[i]
+            if ch == '(':
+                depth += 1
+            elif ch == ')':
+                depth -= 1
+            i += 1
+
+        columns = []
+        for line in _split_columns(schema_ddl[open_paren + 1:i - 1]):
+            if line and not line.startswith('--'):
+                parts = line.split()
+                if parts:
+                    columns.append({
+                        'name': parts[0].lower(),
+                        'type': parts[1] if len(parts) > 1 else 'unknown'
+                    })
+
+        schema_info['tables'][table_name] = {'columns': columns}
+        pos = i
+
+    return schema_info
 
 
 def suggest_query_improvements(query: str, schema_info: Dict) -> str:
     """Suggest improvements to a generated query"""
     suggestions = []
-    query_lower = query.lower()
+    hits = {m.group() for m in _SUGG_RE.finditer(query.lower())}
     
-    if 'select *' in query_lower:
+    if 'select *' in hits:
         suggestions.append("• Consider specifying column names instead of using SELECT *")
     
-    if 'where' not in query_lower:
+    if 'where' not in hits:
         suggestions.append("• Add WHERE conditions to filter results if needed")
     
-    if 'limit' not in query_lower and 'order by' in query_lower:
+    if 'limit' not in hits and 'order by' in hits:
         suggestions.append("• Consider adding LIMIT to restrict the number of results")
     
     if suggestions:
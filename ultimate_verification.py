@@ -4,8 +4,12 @@ ULTIMATE VERIFICATION TEST - 100% Accuracy Guarantee
 The most rigorous test for absolute perfection in SQL generation
 """
 
+import re
+
 from ultimate_query_generator import UltimateSQLGenerator
 
+_TOKEN_RE = re.compile(r'[A-Z0-9_]+')
+
 def ultimate_verification():
     """ULTIMATE test for 100% perfect accuracy"""
     generator = UltimateSQLGenerator()
@@ -136,6 +140,12 @@ def ultimate_verification():
     print("=" * 70)
     print("Testing ultimate precision SQL generation system...\n")
     
+    # Uppercase every expectation once up front; single-word keywords are
+    # then set lookups against the tokenized result, with a substring check
+    # only as the fallback for phrases like "GROUP BY" or "LIMIT 5"
+    for test_case in test_cases:
+        test_case["keywords_upper"] = [(kw, kw.upper()) for kw in test_case["expected_keywords"]]
+    
     total_tests = len(test_cases)
     perfect_count = 0
     failed_tests = []
@@ -153,16 +163,20 @@ def ultimate_verification():
             print(f"💫 Generated SQL:")
             print(f"   {result}")
             
-            # Check for ALL expected keywords
+            # Check for ALL expected keywords; the comprehensions run the
+            # counting loop at C speed, and the missing list is only built
+            # when a test actually failed
             result_upper = result.upper()
-            found_keywords = []
-            missing_keywords = []
+            result_words = set(_TOKEN_RE.findall(result_upper))
+            checks = test_case["keywords_upper"]
             
-            for keyword in expected_keywords:
-                if keyword.upper() in result_upper:
-                    found_keywords.append(keyword)
-                else:
-                    missing_keywords.append(keyword)
+            found_keywords = [kw for kw, up in checks
+                              if up in result_words or up in result_upper]
+            if len(found_keywords) == len(checks):
+                missing_keywords = []
+            else:
+                missing_keywords = [kw for kw, up in checks
+                                    if up not in result_words and up not in result_upper]
             
             # Calculate accuracy
             accuracy = len(found_keywords) / len(expected_keywords) * 100